@@ -1,17 +1,27 @@
-from tkinter.tix import IMMEDIATE
-from typing import Any, Callable, Iterator
-from reactor.injection import InjectionEvent, InjectionModes
+from concurrent.futures import Future
+from typing import Any, Callable, Iterator, Optional
+from reactor.injection import InjectionEvent
 from reactor.returningevent import Event
-from reactor.data.futureview import AwaitingFutureView, ImmediateFutureView
+from reactor.data.futureview import AwaitingFutureView, DeferredFutureView, FutureView, ImmediateFutureView, get_future_view_future
 
 class InjectionModes:
     AWAIT = 0
     AWAITING_VIEW = 1
     IMMEDIATE_VIEW = 2
     FUTURE = 3
+    DEFERRED_VIEW = 4
     
 class AbstractReactor:
-    def run_async(self, callback: Callable):
+    def run_async(self, callback: Callable, priority: int = None):
+        """ Runs the callback asynchronously and returns a future of its result. If the priority is not given then the callback gets the 
+        priority of the event being delivered by the current thread (see "Priorities" class in reactor.event) 
+        """
+        raise NotImplementedError()
+
+    def run_in_process(self, callback: Callable, *args):
+        """ Runs the callback with the arguments in another process and returns a future of its result. Use it for CPU bound replies. The 
+        callback, the arguments and the result must be picklable (so the callback can't be a closure or a lambda) 
+        """
         raise NotImplementedError()
 
     def emit(self, event: Event):
@@ -21,22 +31,116 @@ class AbstractReactor:
         raise NotImplementedError()
     
     def get_injectable(self, query, mode = InjectionModes.AWAIT, injectable_chooser = lambda l: l[0]):
+        cached = self._get_cached_injections(query)
+        if cached is not None:
+            future = Future()
+            try:
+                future.set_result(injectable_chooser(list(cached))) # A copy, so a chooser mutating the list doesn't change the cache
+            except Exception as e:
+                future.set_exception(e)
+            return _wrap_injection(future, mode)
+
         def asnc():
+            cache_key = self._get_injection_cache_key()
             self.emit(e := InjectionEvent(None, query))
-            return injectable_chooser(e.await_injections())
+            injections = e.await_injections()
+            self._cache_injections(query, cache_key, tuple(injections))
+            return injectable_chooser(list(injections))
         if mode == InjectionModes.AWAIT:
-            return self.run_async(asnc).result()
-        elif mode == InjectionModes.FUTURE:
-            return self.run_async(asnc)
-        elif mode == InjectionModes.IMMEDIATE_VIEW:
-            return ImmediateFutureView(self.run_async(asnc)) 
-        elif mode == InjectionModes.AWAITING_VIEW:
-            return AwaitingFutureView(self.run_async(asnc))  
+            return asnc()
         else:
-            raise ValueError(f'Incorrect injection mode {mode}')
+            return _wrap_injection(self.run_async(asnc), mode)
+
+    def _get_injection_cache_key(self) -> Any:
+        """ Returns a value that changes whenever cached injections may become stale """
+        return None
+
+    def _get_cached_injections(self, query) -> Optional[tuple]:
+        """ Returns the injections cached for the query or None. The reactor doesn't cache injections by default """
+        return None
+
+    def _cache_injections(self, query, cache_key, injections: tuple) -> None:
+        """ Caches the injections resolved for the query. "cache_key" is the value "_get_injection_cache_key" returned before the query 
+        was resolved 
+        """
+        pass
+    
+    def inject(self, query, mode = InjectionModes.AWAIT, injectable_chooser = lambda l: l[0], shared = False, unwrap_views = False) -> 'InjectionDescriptor':
+        """ Returns a descriptor of a class attribute that is resolved to the injectable (see "get_injectable") when it is first got. 
+        Can be assigned to a class attribute or used as a decorator of a method, which is then replaced by the attribute. See 
+        "InjectionDescriptor" 
+        """
+        return InjectionDescriptor(self, query, mode, injectable_chooser, shared, unwrap_views)
+
+class InjectionDescriptor:
+    """ Class attribute that gets the injectable from the reactor the first time it is got and caches it. The injectable is got in 
+    the injection mode given, so the attribute can be, for example, a future view of the injectable. If "shared" is False the 
+    injectable is cached in the instance (so getting it again is a plain attribute lookup) and every instance gets its own, 
+    otherwise it is cached in the descriptor and is the same for all instances of the class. Instances without "__dict__" always share
+    the injectable. 
     
-    # This one is supposed to be used as decorator
-    def inject(self, query, mode = InjectionModes.AWAIT, injectable_chooser = lambda l: l[0]):
-        def ret(original):
-            self.inject(query, mode, injectable_chooser)
-        return ret
+    If "unwrap_views" is True and the injectable is got as a future view, the cached view is replaced with the injectable itself once 
+    it is resolved, so the attribute stops going through the view 
+    """
+    def __init__(self, reactor: AbstractReactor, query, mode, injectable_chooser, shared: bool, unwrap_views: bool = False) -> None:
+        self._reactor = reactor
+        self._query = query
+        self._mode = mode
+        self._injectable_chooser = injectable_chooser
+        self._shared = shared
+        self._unwrap_views = unwrap_views
+        self._name = None
+        self._shared_injectable = _NOT_INJECTED
+
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def __call__(self, original: Callable) -> 'InjectionDescriptor':
+        self.__doc__ = original.__doc__
+        return self
+
+    def __get__(self, instance, owner = None):
+        if instance is None:
+            return self
+
+        if self._shared or not hasattr(instance, '__dict__'):
+            if self._shared_injectable is _NOT_INJECTED:
+                self._shared_injectable = injectable = self._reactor.get_injectable(self._query, self._mode, self._injectable_chooser)
+                self._unwrap_when_resolved(injectable, self.__dict__, '_shared_injectable')
+            return self._shared_injectable
+        else:
+            # The descriptor doesn't define "__set__", so after this the instance attribute is found before the descriptor
+            injectable = instance.__dict__[self._name] = self._reactor.get_injectable(self._query, self._mode, self._injectable_chooser)
+            self._unwrap_when_resolved(injectable, instance.__dict__, self._name)
+            return instance.__dict__[self._name]
+
+    def _unwrap_when_resolved(self, injectable, cache: dict, key: str):
+        """ Replaces the future view cached under the key with the injectable once it is resolved, unless something else has been 
+        cached there meanwhile 
+        """
+        if not self._unwrap_views or not isinstance(injectable, FutureView):
+            return
+
+        def on_done(future: Future):
+            if not future.cancelled() and future.exception() is None and cache.get(key) is injectable:
+                cache[key] = future.result()
+        get_future_view_future(injectable).add_done_callback(on_done)
+
+class _NotInjected:
+    pass
+
+_NOT_INJECTED = _NotInjected()
+
+def _wrap_injection(future: Future, mode):
+    if mode == InjectionModes.AWAIT:
+        return future.result()
+    elif mode == InjectionModes.FUTURE:
+        return future
+    elif mode == InjectionModes.IMMEDIATE_VIEW:
+        return ImmediateFutureView(future) 
+    elif mode == InjectionModes.AWAITING_VIEW:
+        return AwaitingFutureView(future)  
+    elif mode == InjectionModes.DEFERRED_VIEW:
+        return DeferredFutureView(future)
+    else:
+        raise ValueError(f'Incorrect injection mode {mode}')
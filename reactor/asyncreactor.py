@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from reactor.injection import InjectionEvent
+from reactor.returningevent import Event
+from reactor.simplereactor import SimpleReactor, TransformationModes
+
+class AsyncReactor(SimpleReactor):
+    """ Reactor driven by an asyncio event loop. Coroutines (and coroutine functions) passed to "run_async" are run by the loop, so
+    replies made with them don't occupy a thread while they are pending. Other callbacks are run by the thread pool like in the simple
+    reactor. Either way "run_async" returns a thread safe future, so the returning events work the same as with the simple reactor, and
+    their "wait_for_reply_async" method awaits the replies without blocking the loop.
+
+    If no loop is given the reactor creates one and runs it in its own thread until "close" is called
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop = None, **kwargs):
+        """ The keyword arguments are passed to the simple reactor """
+        super().__init__(**kwargs)
+
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=loop.run_forever, name='AsyncReactor', daemon=True)
+            self._loop_thread.start()
+        else:
+            self._loop_thread = None
+
+        self._loop = loop
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def run_async(self, callback, priority: int = None) -> Future:
+        """ The priority only applies to callbacks run by the thread pool """
+        if asyncio.iscoroutine(callback):
+            return asyncio.run_coroutine_threadsafe(callback, self._loop)
+        elif asyncio.iscoroutinefunction(callback):
+            return asyncio.run_coroutine_threadsafe(callback(), self._loop)
+        else:
+            return super().run_async(callback, priority)
+
+    async def emit_async(self, event: Event, transformation_mode = TransformationModes.ALL):
+        """ Awaitable counterpart of "emit". Awaits the transform event instead of sleeping the thread """
+        transform_event = self._emit_transform_event(event, transformation_mode)
+        if transform_event is not None:
+            await transform_event.wait_for_reply_async()
+            event = transform_event.previous_reply(None, event)
+        self._deliver(event)
+
+    async def get_injectable_async(self, query, injectable_chooser = lambda l: l[0]):
+        """ Awaitable counterpart of "get_injectable" """
+        injections = self._get_cached_injections(query)
+        if injections is None:
+            cache_key = self._get_injection_cache_key()
+            await self.emit_async(e := InjectionEvent(None, query))
+            injections = tuple(await e.await_injections_async())
+            self._cache_injections(query, cache_key, injections)
+        return injectable_chooser(list(injections))
+
+    def close(self):
+        """ Stops the event loop if the reactor has created it """
+        if self._loop_thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop_thread = None
@@ -1,36 +1,61 @@
-from mimetypes import init
-from typing import Any, Callable, Iterator
+from typing import Any, Callable, Iterator, Optional
 from reactor.event import Event
 
 class Component():
     def on_event(self, reactor, event: Event) -> None:
         pass
 
-class ComponentContainer():
-    def __init__(self) -> None:
-        self._components = []
+    def get_handled_event_types(self) -> Optional[tuple[type]]:
+        """ Returns the event types the component handles (subclasses of them are handled too). The reactor only delivers events 
+        of these types to the component. None means the component receives every event. The value must not change after the component 
+        has been added to a reactor 
+        """
+        return None
 
-    def __init__(self, components: list[Component]) -> None:
-        self._components = components
+class ComponentContainer():
+    def __init__(self, components: list[Component] = None) -> None:
+        self._components = [] if components is None else components
+        self._components_listeners: list[Callable[[Component], None]] = []
+        for i in self._components:
+            self._listen_to_nested(i)
 
     def add_component(self, component: Component):
         self._components.append(component)
+        self._listen_to_nested(component)
+        self._notify_components_listeners(component)
+
+    def add_components_listener(self, listener: Callable[[Component], None]):
+        """ Adds a callable that is called with every component added to the container afterwards, including the components added to 
+        the containers nested in it. Used by reactors to know when cached results that depend on the components become stale 
+        """
+        self._components_listeners.append(listener)
+
+    def _listen_to_nested(self, component: Component):
+        if isinstance(component, ComponentContainer):
+            component.add_components_listener(self._notify_components_listeners)
+
+    def _notify_components_listeners(self, component: Component):
+        for i in self._components_listeners:
+            i(component)
     
     def components_iter(self) -> Iterator:
         return iter(self._components)
 
+    def get_components_count(self) -> int:
+        return len(self._components)
+
 class Distributor(Component, ComponentContainer):
     """ "must_handle_event" method checks if the distributor will deliver the event to components added to it """
     def __init__(self) -> None:
-        super(ComponentContainer, self).__init__()
-        super(Component, self).__init__()
+        Component.__init__(self)
+        ComponentContainer.__init__(self)
     
     def must_handle_event(self, reactor, event: Event) -> bool:
         """ Returns if the event must be handled by the distributor """
         raise NotImplementedError()
 
     def add_component(self, component: Component):
-        self._components.append(component)
+        ComponentContainer.add_component(self, component)
 
     def on_event(self, reactor, event) -> None:
         # This method is not ran asynchronously because if it was the "on_emit_completed" method could be called by the reactor 
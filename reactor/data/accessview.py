@@ -1,4 +1,6 @@
-from typing import Any, Iterable, Union
+from array import array
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Union
 import re
 
 UNDERSCORE_PRIVATE = {re.compile(r'(^_+\w*[a-zA-Z0-9]$)|(^_+$)'): '!r !w !d'}
@@ -22,9 +24,9 @@ class AccessConfig:
     #     'another_attribute_of_source': '!w !d',
     #     'one_more_attribute_of_source': '!d',
     # } 
-    # Forbidding overrides allowing
+    # Forbidding overrides allowing. Decisions are cached for the last "decisions_cache_size" names
     # TODO: Remove this note for future development and write appropriate comment
-    def __init__(self, input: dict[str, Union[str, tuple[str, str]]]):
+    def __init__(self, input: dict[str, Union[str, tuple[str, str]]], decisions_cache_size: int = 1024):
         self.readability = {}
         self.writability = {}
         self.deletability = {}
@@ -32,7 +34,7 @@ class AccessConfig:
 
         for k, v in input.items():
             if isinstance(v, tuple):
-                if isinstance(k, str):
+                if not isinstance(k, str):
                     raise ValueError(f'Tuple ({v}) can only be mapped to a string in access configuration dictionary, but there was ({k})')
 
                 self.aliases[k] = v[0]
@@ -61,17 +63,67 @@ class AccessConfig:
             if 'd' in rule:
                 self.deletability[k] = not '!d' in rule
 
+        self._decisions_cache_size = decisions_cache_size
+        self.compile()
 
-def _check_name(name: str, access_rules: dict[Union[re.Pattern, str], bool]):
-    ret = False
-    for k, v in access_rules.items():
-            if k == name or (isinstance(k, re.Pattern) and k.fullmatch(name) != None):
-                if v:
-                    ret = True
-                else:
-                    return False
+    def compile(self):
+        """ Compiles the readability, writability and deletability rules into decision tables. Call it after changing the rules """
+        self._readability_rules = _AccessRules(self.readability, self._decisions_cache_size)
+        self._writability_rules = _AccessRules(self.writability, self._decisions_cache_size)
+        self._deletability_rules = _AccessRules(self.deletability, self._decisions_cache_size)
+        self._compiled_views: dict[type, type] = {} # Source class mapped to the compiled view class, see "compile_access_view"
+
+    def can_read(self, name: str) -> bool:
+        return self._readability_rules.check(name)
+
+    def can_write(self, name: str) -> bool:
+        return self._writability_rules.check(name)
+
+    def can_delete(self, name: str) -> bool:
+        return self._deletability_rules.check(name)
+
+_INLINE_GLOBAL_FLAGS_PATTERN = re.compile(r'\(\?[aiLmsux]+\)')
+
+def _merge_patterns(patterns: list[re.Pattern]) -> list[re.Pattern]:
+    """ Merges the patterns into as few alternations as possible. Patterns with groups (which may be referred to by number or name), 
+    patterns with inline global flags (which are only allowed at the start of the expression) and patterns with different flags are 
+    not merged with each other 
+    """
+    ret = []
+    by_flags: dict[int, list[re.Pattern]] = {}
+    for i in patterns:
+        if i.groups > 0 or _INLINE_GLOBAL_FLAGS_PATTERN.search(str(i.pattern)) != None:
+            ret.append(i)
+        else:
+            by_flags.setdefault(i.flags, []).append(i)
+
+    for flags, v in by_flags.items():
+        if len(v) == 1:
+            ret.append(v[0])
+            continue
+
+        try:
+            ret.append(re.compile('|'.join(f'(?:{i.pattern})' for i in v), flags))
+        except re.error:
+            ret.extend(v)
     return ret
 
+class _AccessRules:
+    """ Decision table of the rules of one kind of access (e.g. readability). A name is allowed if a rule allowing it matches it and no 
+    rule forbidding it does. Decisions are cached per name 
+    """
+    def __init__(self, access_rules: dict[Union[re.Pattern, str], bool], decisions_cache_size: int) -> None:
+        self._allowed_names = {k for k, v in access_rules.items() if isinstance(k, str) and v}
+        self._forbidden_names = {k for k, v in access_rules.items() if isinstance(k, str) and not v}
+        self._allowing_patterns = _merge_patterns([k for k, v in access_rules.items() if isinstance(k, re.Pattern) and v])
+        self._forbidding_patterns = _merge_patterns([k for k, v in access_rules.items() if isinstance(k, re.Pattern) and not v])
+        self.check = lru_cache(decisions_cache_size)(self._decide)
+
+    def _decide(self, name: str) -> bool:
+        if name in self._forbidden_names or any(i.fullmatch(name) != None for i in self._forbidding_patterns):
+            return False
+        return name in self._allowed_names or any(i.fullmatch(name) != None for i in self._allowing_patterns)
+
 def _get_alias(name: str, aliases: dict[str, str]):
     if name in aliases.keys():
         return aliases[name]
@@ -88,7 +140,7 @@ class AccessView:
         access_config = object.__getattribute__(self, '_access_config')
         string = object.__getattribute__(self, '__str__')
 
-        if _check_name(__name, access_config.readability):
+        if access_config.can_read(__name):
             return getattr(source, _get_alias(__name, access_config.aliases))
         else:
             raise AttributeError(f'View {string()} does not allow getting "{__name}". But an attempt to get it was performed')
@@ -98,7 +150,7 @@ class AccessView:
         access_config = object.__getattribute__(self, '_access_config')
         string = object.__getattribute__(self, '__str__')
 
-        if _check_name(__name, access_config.writability):
+        if access_config.can_write(__name):
             setattr(source, _get_alias(__name, access_config.aliases), __value)
         else:
             raise AttributeError(f'View {string()} does not allow setting "{__name}". But an attempt to set it was performed')
@@ -108,8 +160,153 @@ class AccessView:
         access_config = object.__getattribute__(self, '_access_config')
         string = object.__getattribute__(self, '__str__')
 
-        if _check_name(__name, access_config.deletability):
+        if access_config.can_delete(__name):
             delattr(source, _get_alias(__name, access_config.aliases))
         else:
             raise AttributeError(f'View {string()} does not allow deleting "{__name}". But an attempt to delete it was performed')
-        pass
\ No newline at end of file
+
+def _make_view_property(name: str, source_name: str, access_config: AccessConfig, get_source: Callable[[Any], Any]) -> property:
+    if access_config.can_read(name):
+        def fget(self):
+            return getattr(get_source(self), source_name)
+    else:
+        def fget(self):
+            raise AttributeError(f'View {self} does not allow getting "{name}". But an attempt to get it was performed')
+
+    if access_config.can_write(name):
+        def fset(self, value):
+            setattr(get_source(self), source_name, value)
+    else:
+        def fset(self, value):
+            raise AttributeError(f'View {self} does not allow setting "{name}". But an attempt to set it was performed')
+
+    if access_config.can_delete(name):
+        def fdel(self):
+            delattr(get_source(self), source_name)
+    else:
+        def fdel(self):
+            raise AttributeError(f'View {self} does not allow deleting "{name}". But an attempt to delete it was performed')
+
+    return property(fget, fset, fdel)
+
+_SOURCE_SLOT = '_compiled_view_source'
+
+def compile_access_view(source_class: type, access_config: AccessConfig, attribute_names: Iterable[str] = ()) -> type:
+    """ Returns a subclass of "AccessView" dedicated to viewing instances of the source class with the access configuration. Each attribute 
+    of the source class (and each of "attribute_names", which can name instance attributes) is a property of the view class that 
+    accesses the (aliased) attribute of the source or raises right away if the access is forbidden, so accessing it costs about the 
+    same as reading a property. Other attributes are checked like in "AccessView". Dunder attributes of the view are its own. 
+
+    The source is kept in a slot which descriptor is removed from the class, so it can't be got by an attribute of the view, and the 
+    access configuration is only kept by the properties and the methods of the class. Instances are created with the source only.
+    
+    Compiled classes are cached in the access configuration per source class, so "attribute_names" are only used the first time
+    """
+    compiled_views = access_config._compiled_views
+    ret = compiled_views.get(source_class)
+    if ret is not None:
+        return ret
+
+    names = set(dir(source_class)) | set(attribute_names) | {k for k in access_config.aliases.keys()}
+    for i in (access_config.readability, access_config.writability, access_config.deletability):
+        names.update(k for k in i.keys() if isinstance(k, str))
+    names = frozenset(i for i in names if not (i.startswith('__') and i.endswith('__')) and i != _SOURCE_SLOT)
+
+    def get_source(view):
+        return source_slot.__get__(view, ret)
+
+    def init(self, source: Any) -> None:
+        source_slot.__set__(self, source)
+
+    def getattr_(self, __name: str) -> Any:
+        # Only called when getting the attribute normally fails, that is for attributes that were not compiled
+        if access_config.can_read(__name):
+            return getattr(get_source(self), _get_alias(__name, access_config.aliases))
+        else:
+            raise AttributeError(f'View {self} does not allow getting "{__name}". But an attempt to get it was performed')
+
+    def setattr_(self, __name: str, __value: Any) -> None:
+        if __name in names:
+            object.__setattr__(self, __name, __value)
+        elif access_config.can_write(__name):
+            setattr(get_source(self), _get_alias(__name, access_config.aliases), __value)
+        else:
+            raise AttributeError(f'View {self} does not allow setting "{__name}". But an attempt to set it was performed')
+
+    def delattr_(self, __name: str) -> None:
+        if __name in names:
+            object.__delattr__(self, __name)
+        elif access_config.can_delete(__name):
+            delattr(get_source(self), _get_alias(__name, access_config.aliases))
+        else:
+            raise AttributeError(f'View {self} does not allow deleting "{__name}". But an attempt to delete it was performed')
+
+    namespace = {i: _make_view_property(i, _get_alias(i, access_config.aliases), access_config, get_source) for i in names}
+    namespace['__slots__'] = (_SOURCE_SLOT,)
+    namespace['__init__'] = init
+    namespace['__getattribute__'] = object.__getattribute__
+    namespace['__getattr__'] = getattr_
+    namespace['__setattr__'] = setattr_
+    namespace['__delattr__'] = delattr_
+
+    ret = type(f'{source_class.__name__}AccessView', (AccessView,), namespace)
+    source_slot = ret.__dict__[_SOURCE_SLOT]
+    delattr(ret, _SOURCE_SLOT)
+    compiled_views[source_class] = ret
+    return ret
+
+def compiled_access_view(source: Any, access_config: AccessConfig) -> AccessView:
+    """ Returns a view of the source of the compiled view class of its class (see "compile_access_view"). The attributes the source has 
+    when the class is compiled become properties of the class 
+    """
+    return compile_access_view(type(source), access_config, getattr(source, '__dict__', ()))(source)
+
+class ColumnarAccessView:
+    """ View of a collection of records through one access configuration. Attributes of all records are got, set and deleted at once as 
+    columns, so access is checked once per column instead of once per record 
+    """
+    def __init__(self, sources: Iterable[Any], access_config: AccessConfig) -> None:
+        self._sources = list(sources)
+        self._access_config = access_config
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def get_column(self, name: str, typecode: str = None) -> Union[list, array]:
+        """ Returns the attribute of every record as a list, or as an array of the typecode if it is given """
+        if not self._access_config.can_read(name):
+            raise AttributeError(f'View {self} does not allow getting "{name}". But an attempt to get it was performed')
+        
+        source_name = _get_alias(name, self._access_config.aliases)
+        values = [getattr(i, source_name) for i in self._sources] # Not "attrgetter", it would follow dotted names past the access check
+        return values if typecode is None else array(typecode, values)
+
+    def set_column(self, name: str, values: Iterable[Any]) -> None:
+        """ Sets the attribute of each record to the value at the same position """
+        if not self._access_config.can_write(name):
+            raise AttributeError(f'View {self} does not allow setting "{name}". But an attempt to set it was performed')
+        
+        values = list(values)
+        if len(values) != len(self._sources):
+            raise ValueError(f'Got {len(values)} values for column "{name}" of {len(self._sources)} records')
+
+        source_name = _get_alias(name, self._access_config.aliases)
+        for source, value in zip(self._sources, values):
+            setattr(source, source_name, value)
+
+    def delete_column(self, name: str) -> None:
+        if not self._access_config.can_delete(name):
+            raise AttributeError(f'View {self} does not allow deleting "{name}". But an attempt to delete it was performed')
+        
+        source_name = _get_alias(name, self._access_config.aliases)
+        for source in self._sources:
+            delattr(source, source_name)
+
+    def filter(self, name: str, predicate: Callable[[Any], bool]) -> 'ColumnarAccessView':
+        """ Returns a view of the records which attribute satisfies the predicate """
+        column = self.get_column(name)
+        return ColumnarAccessView([s for s, v in zip(self._sources, column) if predicate(v)], self._access_config)
+
+    def records(self) -> list[AccessView]:
+        """ Returns views of the records one by one """
+        return [AccessView(i, self._access_config) for i in self._sources]
@@ -1,46 +1,130 @@
 from concurrent.futures import Future
-from typing import Any
+from functools import partial
+import logging
+from typing import Any, Callable
 
-# TODO: Add method that will be used to check if the future has resolved 
+class _Unresolved:
+    pass
+
+_UNRESOLVED = _Unresolved()
 
 class FutureView:
+    """ Base of the proxies of the object a future resolves to. Once the future is resolved successfully the object is captured by the 
+    view, so the views which get it synchronously access it directly instead of going through the future 
+    """
     def __init__(self, source: Future) -> None:
         object.__setattr__(self, '_source', source)
+        object.__setattr__(self, '_resolved', _UNRESOLVED)
+        source.add_done_callback(partial(_capture_resolved, self)) # Getting a method of "self" would go through the proxy
+
+def _capture_resolved(future_view: FutureView, source: Future):
+    if not source.cancelled() and source.exception() is None:
+        object.__setattr__(future_view, '_resolved', source.result())
 
 def is_future_view_done(future_view: FutureView):
-    return future_view._source.done()
+    return object.__getattribute__(future_view, '_source').done()
 
 def get_future_view_result(future_view: FutureView, timeout: float = None):
-    return future_view._source.result(timeout)
+    return object.__getattribute__(future_view, '_source').result(timeout)
+
+def unwrap_future_view(future_view: FutureView) -> Any:
+    """ Returns the object the view is of if the future has been resolved successfully, otherwise returns the view itself """
+    resolved = object.__getattribute__(future_view, '_resolved')
+    return future_view if resolved is _UNRESOLVED else resolved
 
 class ImmediateFutureView(FutureView):
     def __init__(self, source: Future) -> None:
-        FutureView.__init(self, source)
+        FutureView.__init__(self, source)
 
     def __getattribute__(self, __name: str) -> Any:
-        source = object.__getattribute__(self, '_source')
-        return getattr(source.result(0), __name)
+        resolved = object.__getattribute__(self, '_resolved')
+        if resolved is _UNRESOLVED:
+            resolved = object.__getattribute__(self, '_source').result(0)
+        return getattr(resolved, __name)
 
     def __setattr__(self, __name: str, __value: Any) -> None:
-        source = object.__getattribute__(self, '_source')
-        setattr(source.result(0), __name, __value)
+        resolved = object.__getattribute__(self, '_resolved')
+        if resolved is _UNRESOLVED:
+            resolved = object.__getattribute__(self, '_source').result(0)
+        setattr(resolved, __name, __value)
 
     def __delattr__(self, __name: str) -> None:
-        source = object.__getattribute__(self, '_source')
-        delattr(source.result(0), __name)
+        resolved = object.__getattribute__(self, '_resolved')
+        if resolved is _UNRESOLVED:
+            resolved = object.__getattribute__(self, '_source').result(0)
+        delattr(resolved, __name)
 
 class AwaitingFutureView(FutureView):
     def __init__(self, source: Future) -> None:
-        FutureView.__init(self, source)
+        FutureView.__init__(self, source)
+
+    def __getattribute__(self, __name: str) -> Any:
+        resolved = object.__getattribute__(self, '_resolved')
+        if resolved is _UNRESOLVED:
+            resolved = object.__getattribute__(self, '_source').result()
+        return getattr(resolved, __name)
+
+    def __setattr__(self, __name: str, __value: Any) -> None:
+        resolved = object.__getattribute__(self, '_resolved')
+        if resolved is _UNRESOLVED:
+            resolved = object.__getattribute__(self, '_source').result()
+        setattr(resolved, __name, __value)
+
+    def __delattr__(self, __name: str) -> None:
+        resolved = object.__getattribute__(self, '_resolved')
+        if resolved is _UNRESOLVED:
+            resolved = object.__getattribute__(self, '_source').result()
+        delattr(resolved, __name)
+
+class DeferredFutureView(FutureView):
+    """ Future view that never blocks. Getting an attribute or calling the view is deferred until the future is resolved and returns 
+    another deferred future view of the result, so calls can be chained on the view before the object exists (for example 
+    "view.storage.load('key')"). Setting and deleting attributes is deferred the same way. The deferred operations are run by the thread 
+    which resolves the future (or right away if it is already resolved) in the order they were made. Use "get_future_view_result" or
+    "get_future_view_future" to get the result of a deferred operation. Exceptions of deferred setting and deleting are logged
+    """
+    def __init__(self, source: Future) -> None:
+        FutureView.__init__(self, source)
 
     def __getattribute__(self, __name: str) -> Any:
         source = object.__getattribute__(self, '_source')
-        return getattr(source.result(), __name)
+        return DeferredFutureView(_chain_future(source, lambda i: getattr(i, __name)))
 
     def __setattr__(self, __name: str, __value: Any) -> None:
         source = object.__getattribute__(self, '_source')
-        setattr(source.result(), __name, __value)
+        _chain_future(source, lambda i: setattr(i, __name, __value)).add_done_callback(_log_deferred_exception)
 
     def __delattr__(self, __name: str) -> None:
         source = object.__getattribute__(self, '_source')
-        delattr(source.result(), __name)
\ No newline at end of file
+        _chain_future(source, lambda i: delattr(i, __name)).add_done_callback(_log_deferred_exception)
+
+    def __call__(self, *args, **kwargs) -> 'DeferredFutureView':
+        source = object.__getattribute__(self, '_source')
+        return DeferredFutureView(_chain_future(source, lambda i: i(*args, **kwargs)))
+
+def get_future_view_future(future_view: FutureView) -> Future:
+    return object.__getattribute__(future_view, '_source')
+
+def _chain_future(source: Future, callback: Callable[[Any], Any]) -> Future:
+    """ Returns a future of the callback called with the result of the source future once it is resolved """
+    chained = Future()
+    def on_done(source: Future):
+        if source.cancelled():
+            chained.cancel()
+            return
+        if not chained.set_running_or_notify_cancel():
+            return # The chained future has been cancelled itself
+
+        if (exception := source.exception()) is not None:
+            chained.set_exception(exception)
+        else:
+            try:
+                chained.set_result(callback(source.result()))
+            except BaseException as e:
+                chained.set_exception(e)
+    source.add_done_callback(on_done)
+    return chained
+
+def _log_deferred_exception(future: Future):
+    if not future.cancelled() and (exception := future.exception()) is not None:
+        logging.getLogger(__name__).error('Deferred operation on a future view has failed', exc_info=exception)
@@ -1,46 +1,119 @@
-
+from contextlib import contextmanager
 from threading import Lock
-from typing import Any
-from reactor.reactor.event import Event
-from reactor.reactor.reactor import AbstractReactor
+from typing import Any, Iterator
+from reactor.event import Event
+from reactor.abstractreactor import AbstractReactor
 
-# TODO: Test and debug the views. By now they are "blind written"
 # TODO: Maybe the synchronization is not needed
 
-class __BaseReactorView():
+class _Missing:
+    pass
+
+MISSING = _Missing() # Old value of an attribute that the source didn't have, or new value of a deleted one
+
+class _BaseReactorView():
     def __init__(self, source: Any, reactor: AbstractReactor) -> None:
         object.__setattr__(self, '_source', source)
         object.__setattr__(self, '_reactor', reactor)
         object.__setattr__(self, '_lock', Lock()) # General lock to lock nearly in any situation
+        object.__setattr__(self, '_batch_depth', 0)
+        object.__setattr__(self, '_batch_changes', {}) # Name -> [old value, new value] of the attributes changed in the batch
 
     def __getattribute__(self, __name: str) -> Any:
         return getattr(object.__getattribute__(self, '_source'), __name)
 
     def __setattr__(self, __name: str, __value: Any) -> None:
         setattr(object.__getattribute__(self, '_source'), __name, __value)
-        
+
     def __delattr__(self, __name: str) -> None:
         delattr(object.__getattribute__(self, '_source'), __name)
 
+def _batch_change(view: _BaseReactorView, name: str, old_value: Any, new_value: Any) -> bool:
+    """ Records the change if the view is in a batch and returns whether it has. Must be called with the view locked """
+    if object.__getattribute__(view, '_batch_depth') == 0:
+        return False
+
+    changes = object.__getattribute__(view, '_batch_changes')
+    if name in changes:
+        changes[name][1] = new_value # Coalesced, the attribute keeps the value it had before the batch as the old one
+    else:
+        changes[name] = [old_value, new_value]
+    return True
+
+@contextmanager
+def batch_reactor_view(view: _BaseReactorView) -> Iterator[_BaseReactorView]:
+    """ Context in which the changes made through the view are applied to the source right away, but instead of emitting an event for
+    each of them, a single "ReactorViewChangesEvent" with all of them is emitted when the context is exited. Changes of the same
+    attribute are coalesced into one. Batches can be nested, the event is emitted when the outermost one is exited. The changes are
+    made by any thread, not only by the one that has entered the batch
+    """
+    lock = object.__getattribute__(view, '_lock')
+    with lock:
+        object.__setattr__(view, '_batch_depth', object.__getattribute__(view, '_batch_depth') + 1)
+
+    try:
+        yield view
+    finally:
+        with lock:
+            depth = object.__getattribute__(view, '_batch_depth') - 1
+            object.__setattr__(view, '_batch_depth', depth)
+            changes = object.__getattribute__(view, '_batch_changes')
+            if depth == 0:
+                object.__setattr__(view, '_batch_changes', {})
+
+        if depth == 0 and len(changes) > 0:
+            source = object.__getattribute__(view, '_source')
+            reactor = object.__getattribute__(view, '_reactor')
+            reactor.emit(ReactorViewChangesEvent(view, source, {k: tuple(v) for k, v in changes.items()}))
+
 class ReactorViewEvent(Event):
     def __init__(self, view, source, name) -> None:
-        super().__init__()
+        super().__init__(None)
         self._view = view
         self._source = source
         self._name = name
 
+    def get_view(self):
+        return self._view
+
+    def get_source(self):
+        return self._source
+
+    def get_name(self) -> str:
+        return self._name
+
+class ReactorViewChangesEvent(Event):
+    """ Emitted at the end of a batch (see "batch_reactor_view") with all the changes made in it. The changes map the names of the
+    attributes to pairs of the value before the batch and the value after it. "MISSING" stands for the value of an attribute that the
+    source didn't have or has deleted
+    """
+    def __init__(self, view, source, changes: dict[str, tuple[Any, Any]]) -> None:
+        super().__init__(None)
+        self._view = view
+        self._source = source
+        self._changes = changes
+
+    def get_view(self):
+        return self._view
+
+    def get_source(self):
+        return self._source
+
+    def get_changes(self) -> dict[str, tuple[Any, Any]]:
+        return self._changes
+
 class GetterReactorViewEvent(ReactorViewEvent):
     def __init__(self, view, source, name, value) -> None:
         super().__init__(view, source, name)
         self._value = value
 
-class GetterReactorView(__BaseReactorView):
-    """ Mimics attributes of the source object (the one passed to the "__init__"). Whenever an attribute 
+class GetterReactorView(_BaseReactorView):
+    """ Mimics attributes of the source object (the one passed to the "__init__"). Whenever an attribute
     of this object is accessed it returns attribute of the same name from the source and emits an event
-    describing the accessing. The event is emitted only when something gets the attribute (not sets or deletes it)  
+    describing the accessing. The event is emitted only when something gets the attribute (not sets or deletes it)
     """
     def __init__(self, source: Any, reactor: AbstractReactor) -> None:
-        __BaseReactorView.__init__(self, source, reactor)
+        _BaseReactorView.__init__(self, source, reactor)
 
     def __getattribute__(self, __name: str) -> Any:
         with object.__getattribute__(self, '_lock'):
@@ -48,9 +121,9 @@ class GetterReactorView(__BaseReactorView):
             reactor = object.__getattribute__(self, '_reactor')
 
             ret = getattr(source, __name)
-            reactor.emit(GetterReactorView(self, source, __name, ret))
+            reactor.emit(GetterReactorViewEvent(self, source, __name, ret))
 
-            return ret   
+            return ret
 
 class SetterReactorViewEvent(ReactorViewEvent):
     def __init__(self, view, source, name, old_value, new_value) -> None:
@@ -58,31 +131,38 @@ class SetterReactorViewEvent(ReactorViewEvent):
         self._old_value = old_value
         self._new_value = new_value
 
-class SetterReactorView(__BaseReactorView):
-    """ Mimics attributes of the source object (the one passed in the "__init__"). Whenever an attribute 
+class SetterReactorView(_BaseReactorView):
+    """ Mimics attributes of the source object (the one passed in the "__init__"). Whenever an attribute
     of this object is set to a value it sets the value on attribute of the same name in the source and emits an event
-    describing the action. The event is emitted only when something gets the attribute (not sets or deletes it)  
+    describing the action. The event is emitted only when something sets the attribute (not gets or deletes it). In a batch
+    (see "batch_reactor_view") the setting is emitted with the other changes of the batch
     """
     def __init__(self, source: Any, reactor: AbstractReactor) -> None:
-        __BaseReactorView.__init__(self, source, reactor)
+        _BaseReactorView.__init__(self, source, reactor)
 
     def __setattr__(self, __name: str, __value: Any) -> None:
         with object.__getattribute__(self, '_lock'):
             source = object.__getattribute__(self, '_source')
             reactor = object.__getattribute__(self, '_reactor')
 
-            old = getattr(source, __name)
+            old = getattr(source, __name, MISSING)
             setattr(source, __name, __value)
-            reactor.emit(SetterReactorViewEvent(self, source, __name, old, getattr(source, __name)))
+            new = getattr(source, __name)
+            if not _batch_change(self, __name, old, new):
+                reactor.emit(SetterReactorViewEvent(self, source, __name, old, new))
 
 class DeletingReactorViewEvent(ReactorViewEvent):
     def __init__(self, view, source, name, last_value) -> None:
         super().__init__(view, source, name)
         self._last_value = last_value
 
-class DeletingReactorView(__BaseReactorView):
+class DeletingReactorView(_BaseReactorView):
+    """ Mimics attributes of the source object. Whenever an attribute of this object is deleted it deletes the attribute of the same
+    name from the source and emits an event describing the action. In a batch (see "batch_reactor_view") the deleting is emitted with
+    the other changes of the batch
+    """
     def __init__(self, source: Any, reactor: AbstractReactor) -> None:
-        __BaseReactorView.__init__(source, reactor)
+        _BaseReactorView.__init__(self, source, reactor)
 
     def __delattr__(self, __name: str) -> None:
         with object.__getattribute__(self, '_lock'):
@@ -91,4 +171,5 @@ class DeletingReactorView(__BaseReactorView):
 
             last_value = getattr(source, __name)
             delattr(source, __name)
-            reactor.emit(DeletingReactorViewEvent(self, source, __name, last_value))
\ No newline at end of file
+            if not _batch_change(self, __name, last_value, MISSING):
+                reactor.emit(DeletingReactorViewEvent(self, source, __name, last_value))
@@ -1,6 +1,6 @@
 from typing import Any, Callable
 from weakref import WeakSet
-from reactor.event import Event
+from reactor.event import Event, Priorities
 
 from reactor.abstractreactor import AbstractReactor
 
@@ -45,6 +45,8 @@ class val:
             return old
 
 class RValEvent(Event):
+    priority = Priorities.LOW
+
     def __init__(self, rval, old_value, new_value) -> None:
         self._rval = rval
         self._old_value = old_value
@@ -1,7 +1,16 @@
+import asyncio
 import threading
 
+class Priorities:
+    """ Priorities of events and of the callbacks run for them. The lower the value the sooner the reactor runs the callbacks """
+    CRITICAL = 0
+    HIGH = 1
+    NORMAL = 2
+    LOW = 3
 
 class Event:
+    priority = Priorities.NORMAL # Can be overridden in subclasses or set on instances
+
     def __init__(self, source_component) -> None:
         self._source_component = source_component
 
@@ -13,10 +22,40 @@ class EmittedFlagBlockingEvent(Event):
     def __init__(self, source_component) -> None:
         super().__init__(source_component)
         self._emit_completed = threading.Event()
+        self._emit_completed_lock = threading.Lock()
+        self._emit_completed_waiters: list[asyncio.Future] = [] # Futures of the coroutines awaiting the completion, see "wait_for_emit_completed_async"
 
     def on_emit_completed(self) -> None:
         super().on_emit_completed()
-        self._emit_completed.set()
+        with self._emit_completed_lock:
+            self._emit_completed.set()
+            waiters, self._emit_completed_waiters = self._emit_completed_waiters, []
+        for i in waiters:
+            i.get_loop().call_soon_threadsafe(_set_waiter_done, i)
 
     def is_emit_completed(self) -> bool:
         return self._emit_completed.is_set()
+
+    async def wait_for_emit_completed_async(self) -> None:
+        """ Suspends the awaiting coroutine until the emitting of the event is completed. The thread completing the emitting wakes the 
+        coroutine up through its event loop, so no thread waits for the completion 
+        """
+        if self._emit_completed.is_set():
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        with self._emit_completed_lock:
+            if self._emit_completed.is_set():
+                return
+            self._emit_completed_waiters.append(waiter)
+
+        try:
+            await waiter
+        finally:
+            with self._emit_completed_lock: # The waiter is still there if the coroutine was cancelled, e.g. by a timeout
+                if waiter in self._emit_completed_waiters:
+                    self._emit_completed_waiters.remove(waiter)
+
+def _set_waiter_done(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -1,9 +1,11 @@
 
 from collections import OrderedDict
 from concurrent.futures import Future, wait
-from typing import Any, Callable
+import threading
+from typing import Any, Callable, Optional
+import warnings
 from reactor.returningevent import EmittedFlagBlockingEvent, ReturningEvent, SequentialReturningEvent
-from reactor.component import Distributor
+from reactor.component import Component, Distributor
 from reactor.injection import BaseNamedInjectable
 
 class __NoInstance:
@@ -13,13 +15,117 @@ _NO_INSTANCE = __NoInstance()
 
 class FabricationEvent(SequentialReturningEvent):
     """ Used to create instances of... TODO: This comment """
-    def __init__(self, source_component, instance_type: type) -> None:
+    def __init__(self, source_component, instance_type: type, context: Any = None) -> None:
         super().__init__(source_component)
         self._instance_type = instance_type
+        self.context = context
 
     def get_instance_type(self) -> type:
         return self._instance_type
 
+class FabricationItem:
+    """ One instance of a batch fabrication event. Given to the things creating a single instance (like attribute creators of the 
+    attributes appender) instead of the batch event. Has the instance type and the context like a fabrication event, but none of its 
+    synchronization, so batches of many instances are cheap to create 
+    """
+    __slots__ = ('_instance_type', 'context')
+
+    def __init__(self, instance_type: type, context: Any = None) -> None:
+        self._instance_type = instance_type
+        self.context = context
+
+    def get_instance_type(self) -> type:
+        return self._instance_type
+
+class BatchFabricationEvent(FabricationEvent):
+    """ Creates many instances of the type at once. Either "count" of instances are created or an instance per item of "contexts". 
+    Factories reply with lists of the instances. Things creating a single instance (like attribute creators of the attributes appender) 
+    get the fabrication item of the instance (see "FabricationItem") instead of the batch event 
+    """
+    def __init__(self, source_component, instance_type: type, count: int = None, contexts: list = None) -> None:
+        super().__init__(source_component, instance_type)
+        if (count is None) == (contexts is None):
+            raise ValueError('Exactly one of "count" and "contexts" must be given to a batch fabrication event')
+        contexts = [None] * count if contexts is None else contexts
+        self._items = [FabricationItem(instance_type, i) for i in contexts]
+
+    def get_items(self) -> list[FabricationItem]:
+        return self._items
+
+def _clear_attributes(instance):
+    if hasattr(instance, '__dict__'):
+        instance.__dict__.clear()
+    for i in getattr(type(instance), '__slots__', ()):
+        if hasattr(instance, i):
+            delattr(instance, i)
+
+class InstancePool:
+    """ Keeps released instances of a type to give them out again instead of creating new ones. Released instances are reset by the 
+    reset hook (by default the attributes of the instance are deleted). Instances released when the pool already holds "max_size" 
+    instances are dropped. Add the pool to the factory distributor of the reactor to make factories take instances from it 
+    """
+    def __init__(self, instance_type: type, max_size: int = 1024, reset: Callable[[Any], None] = _clear_attributes) -> None:
+        self._instance_type = instance_type
+        self._max_size = max_size
+        self._reset = reset
+        self._instances = []
+        self._lock = threading.Lock()
+        self._hits_count = 0
+        self._misses_count = 0
+        self._dropped_count = 0
+
+    def get_instance_type(self) -> type:
+        return self._instance_type
+
+    def acquire(self, instance_class: type = None) -> Any:
+        """ Returns a released instance, or a new one if there is none. The new instance is of "instance_class" if it is given, it must be 
+        a subclass of the type of the pool 
+        """
+        with self._lock:
+            if len(self._instances) > 0:
+                self._hits_count += 1
+                return self._instances.pop()
+            self._misses_count += 1
+        return (self._instance_type if instance_class is None else instance_class)()
+
+    def release(self, instance) -> bool:
+        """ Resets the instance and keeps it to be acquired again. Returns False if the instance has been dropped as the pool is full """
+        if len(self._instances) >= self._max_size:
+            self._dropped_count += 1
+            return False
+        self._reset(instance)
+        with self._lock:
+            if len(self._instances) >= self._max_size:
+                self._dropped_count += 1
+                return False
+            self._instances.append(instance)
+        return True
+
+    def get_size(self) -> int:
+        return len(self._instances)
+
+    def get_hits_count(self) -> int:
+        return self._hits_count
+
+    def get_misses_count(self) -> int:
+        return self._misses_count
+
+    def get_dropped_count(self) -> int:
+        return self._dropped_count
+
+def new_instance(reactor, instance_type: type) -> Any:
+    """ Returns an instance of the type from the instance pool added to the factory distributor of the reactor, or a new instance if 
+    there is no such pool. The instance is of the slotted class of the type if the distributor has one 
+    """
+    if hasattr(reactor, 'get_factory_distributor'):
+        distributor = reactor.get_factory_distributor()
+        pool = distributor.get_instance_pool(instance_type)
+        instance_class = distributor.get_instance_class(instance_type, reactor)
+        if pool is not None:
+            return pool.acquire(instance_class)
+        return instance_class()
+    return instance_type()
+
 class FactoryComponent(Component):
     def __init__(self, accepted_instance_types: tuple[type]) -> None:
         super().__init__()
@@ -32,7 +138,7 @@ class FactoryComponent(Component):
     def create_new(self, reactor, event):
         try:
             if len(self._accepted_instance_types) == 1 and isinstance(self._accepted_instance_types[0], type):
-                return self._accepted_instance_types[0]()
+                return new_instance(reactor, self._accepted_instance_types[0])
             else:
                 return None
         except:
@@ -41,23 +147,43 @@ class FactoryComponent(Component):
     def get_accepted_instance_types(self) -> set[type]:
         return self._accepted_instance_types
 
+    def get_handled_event_types(self) -> tuple[type]:
+        return (FabricationEvent,)
+
+    def create(self, reactor, previous_instance, event) -> Any:
+        """ Creates the instance from the instance created by the previous factory, or a new one if there is none. Returns None if 
+        creating fails 
+        """
+        try:
+            return self.create_new(reactor, event) if previous_instance == _NO_INSTANCE else self.create_instance_from_previous(reactor, previous_instance, event)
+        except:
+            return None
+
+    def create_batch(self, reactor, previous_instances, event: BatchFabricationEvent) -> list:
+        """ Batch counterpart of "create". "previous_instances" is the list created by the previous factory, if there is none then new 
+        instances are created 
+        """
+        items = event.get_items()
+        if previous_instances == _NO_INSTANCE:
+            previous_instances = [_NO_INSTANCE] * len(items)
+        return [self.create(reactor, i, e) for i, e in zip(previous_instances, items)]
+
     def on_event(self, reactor, event) -> None:
-        if isinstance(event, FabricationEvent) and event.get_instance_type() in self._accepted_instance_types:
-            def asnc():
-                instance = event.previous_reply(self, _NO_INSTANCE)
-                try:
-                    return self.create_new(reactor, event) if instance == _NO_INSTANCE else self.create_instance_from_previous(reactor, instance, event)
-                except:
-                    return None
-            event.reply(self, reactor.run_async(asnc))
+        if isinstance(event, BatchFabricationEvent) and event.get_instance_type() in self._accepted_instance_types:
+            event.reply_after_previous(self, reactor, lambda instances: self.create_batch(reactor, instances, event), _NO_INSTANCE)
+        elif isinstance(event, FabricationEvent) and event.get_instance_type() in self._accepted_instance_types:
+            event.reply_after_previous(self, reactor, lambda instance: self.create(reactor, instance, event), _NO_INSTANCE)
 
 class AttributesAppender(FactoryComponent):
     def __init__(self, accepted_instance_type: type, attribute_creators: dict[str, Callable]) -> None:
         super().__init__((accepted_instance_type,))
         self._attribute_creators = attribute_creators
 
+    def get_attribute_names(self) -> list[str]:
+        return list(self._attribute_creators.keys())
+
     def create_new(self, reactor, event):
-        ret = self._accepted_instance_types[0]()
+        ret = new_instance(reactor, self._accepted_instance_types[0])
         
         for k, v in self._attribute_creators.items():
             setattr(ret, k, v(ret, event))
@@ -65,19 +191,158 @@ class AttributesAppender(FactoryComponent):
 
     def create_instance_from_previous(self, reactor, previous_instance, event) -> Any:
         if previous_instance == None or previous_instance == _NO_INSTANCE: 
-            previous_instance = self._accepted_instance_types[0]()
+            previous_instance = new_instance(reactor, self._accepted_instance_types[0])
         
         for k, v in self._attribute_creators.items():
             setattr(previous_instance, k, v(previous_instance, event))
         return previous_instance
 
+    def create_batch(self, reactor, previous_instances, event: BatchFabricationEvent) -> list:
+        """ Applies each attribute creator across the whole batch. Instances for which an attribute creator fails are replaced by None """
+        items = event.get_items()
+        if previous_instances == _NO_INSTANCE:
+            previous_instances = [None] * len(items)
+
+        instance_type = self._accepted_instance_types[0]
+        instances = [new_instance(reactor, instance_type) if i is None or i == _NO_INSTANCE else i for i in previous_instances]
+        failed = set()
+
+        for k, v in self._attribute_creators.items():
+            for index, (instance, item) in enumerate(zip(instances, items)):
+                if index not in failed:
+                    try:
+                        setattr(instance, k, v(instance, item))
+                    except:
+                        failed.add(index)
+        return [None if i in failed else instance for i, instance in enumerate(instances)]
+
+class FabricationPlan:
+    """ The chain of factories creating instances of a type, in the order the factories are called """
+    def __init__(self, factories: tuple[FactoryComponent]) -> None:
+        self._factories = factories
+
+    def get_factories(self) -> tuple[FactoryComponent]:
+        return self._factories
+
+    def create(self, reactor, previous_instance, event) -> Any:
+        """ Runs the whole chain, starting with the previous instance """
+        instance = previous_instance
+        for i in self._factories:
+            instance = i.create(reactor, instance, event)
+        return instance
+
+    def create_batch(self, reactor, previous_instances, event: BatchFabricationEvent) -> list:
+        instances = previous_instances
+        for i in self._factories:
+            instances = i.create_batch(reactor, instances, event)
+        return instances
+
 class FactoryDistributor(Distributor, BaseNamedInjectable):
-    def __init__(self, injectable_name = 'factory_distributor') -> None:
-        super(Distributor, self).__init__()
-        super(BaseNamedInjectable, self).__init__(injectable_name)
+    """ Distributes fabrication events to the factories added to it. Instead of letting every factory reply to a fabrication event the 
+    distributor compiles the factories accepting the instance type into a fabrication plan once and replies with the result of the 
+    whole plan, which is run by a single task (or by the replying thread if "inline" is True). The plans are compiled again when a 
+    component is added. If a component that is not a plain factory component (one that overrides "on_event" or is not a factory 
+    component at all) may handle fabrication events then the events are distributed to each component instead 
+    """
+    def __init__(self, injectable_name = 'factory_distributor', inline: bool = False) -> None:
+        Distributor.__init__(self)
+        BaseNamedInjectable.__init__(self, injectable_name)
+        self._inline = inline
+        self._fabrication_plans: dict[type, Optional[FabricationPlan]] = {}
+        self._instance_pools: dict[type, InstancePool] = {}
+        self._slotted_types: set[type] = set()
+        self._slotted_classes: dict[type, type] = {}
+
+    def add_slotted_type(self, instance_type: type):
+        """ Makes factories create instances of a generated subclass of the type that has "__slots__" for the attributes created by the 
+        attribute appenders of the type (the ones added to the distributor and the ones added to the reactor directly), instead of 
+        instances of the type. Attributes then don't take space in "__dict__" of the instances (the instances have no "__dict__" at all 
+        if the type and its bases declare "__slots__"). The class is generated when the type is first fabricated, so appenders added to 
+        the reactor after that are not taken into account. Instances of the generated class can't be pickled 
+        """
+        self._slotted_types.add(instance_type)
+        self._slotted_classes = {}
+
+    def get_instance_class(self, instance_type: type, reactor = None) -> type:
+        """ Returns the class which instances are created when fabricating the type: the generated slotted class of the type (see 
+        "add_slotted_type") or the type itself. If the reactor is given its attribute appenders are taken into account too 
+        """
+        if instance_type not in self._slotted_types:
+            return instance_type
+
+        classes = self._slotted_classes
+        ret = classes.get(instance_type)
+        if ret is None:
+            components = list(self._components)
+            if reactor is not None and hasattr(reactor, 'components_iter'):
+                components.extend(reactor.components_iter())
+
+            names = set()
+            for i in components:
+                if isinstance(i, AttributesAppender) and instance_type in i.get_accepted_instance_types():
+                    names.update(i.get_attribute_names())
+            if len(names) == 0:
+                warnings.warn(f'No attribute appenders of {instance_type.__name__} were found, so its slotted class has no slots', stacklevel=2)
+
+            # Names of attributes of the type are left out as slots would hide them
+            slots = tuple(sorted(i for i in names if not hasattr(instance_type, i)))
+            ret = classes[instance_type] = type(f'Slotted{instance_type.__name__}', (instance_type,), {
+                '__slots__': slots, 
+                '__module__': instance_type.__module__, 
+                '_fabricated_type': instance_type,
+            })
+        return ret
+
+    def add_instance_pool(self, pool: InstancePool):
+        """ Makes factories take instances of the type of the pool from it instead of creating them """
+        self._instance_pools[pool.get_instance_type()] = pool
+
+    def get_instance_pool(self, instance_type: type) -> Optional[InstancePool]:
+        return self._instance_pools.get(instance_type)
+
+    def release_instance(self, instance) -> bool:
+        """ Returns the fabricated instance to the pool of its type. Returns False if there is no such pool or the pool is full """
+        pool = self._instance_pools.get(getattr(type(instance), '_fabricated_type', type(instance)))
+        return pool is not None and pool.release(instance)
+
+    def add_component(self, component):
+        super().add_component(component)
+        self._fabrication_plans = {}
+        self._slotted_classes = {}
+
+    def get_fabrication_plan(self, instance_type: type) -> Optional[FabricationPlan]:
+        """ Returns the fabrication plan of the instance type, or None if the fabrication events can't be handled by a plan """
+        plans = self._fabrication_plans
+        if instance_type in plans:
+            return plans[instance_type]
+
+        factories = []
+        for i in self._components:
+            if isinstance(i, FactoryComponent) and type(i).on_event is FactoryComponent.on_event:
+                if instance_type in i.get_accepted_instance_types():
+                    factories.append(i)
+            elif i.get_handled_event_types() is None or issubclass(FabricationEvent, i.get_handled_event_types()):
+                factories = None
+                break
+
+        ret = plans[instance_type] = None if factories is None else FabricationPlan(tuple(factories))
+        return ret
+
+    def on_event(self, reactor, event) -> None:
+        if self.must_handle_event(reactor, event):
+            plan = self.get_fabrication_plan(event.get_instance_type())
+            if plan is None:
+                super().on_event(reactor, event)
+            elif len(plan.get_factories()) > 0 and isinstance(event, BatchFabricationEvent):
+                event.reply_after_previous(self, reactor, lambda instances: plan.create_batch(reactor, instances, event), _NO_INSTANCE, self._inline)
+            elif len(plan.get_factories()) > 0:
+                event.reply_after_previous(self, reactor, lambda instance: plan.create(reactor, instance, event), _NO_INSTANCE, self._inline)
 
     def must_handle_event(self, reactor, event) -> bool:
         return isinstance(event, FabricationEvent)
 
+    def get_handled_event_types(self) -> tuple[type]:
+        return (FabricationEvent,)
+
     def get_injectable_name(self) -> str:
-        return self._injectable_name
\ No newline at end of file
+        return self._injectable_name
@@ -1,7 +1,9 @@
 from functools import reduce
 import operator
+from concurrent.futures import Future
+import threading
 from typing import Union
-from reactor.event import Event
+from reactor.event import Event, Priorities
 from reactor.component import Component, ComponentContainer
 from reactor.returningevent import ParallelReturningEvent
 
@@ -21,6 +23,8 @@ class BaseNamedInjectable(AbstractNamedInjectable):
         return self._injectable_name
 
 class InjectionEvent(ParallelReturningEvent):
+    priority = Priorities.HIGH
+
     def __init__(self, source_component, injection_query: Union[str, type]) -> None:
         super().__init__(source_component)
         self.injection_query = injection_query
@@ -29,29 +33,75 @@ class InjectionEvent(ParallelReturningEvent):
         self.wait_for_reply()
         return reduce(operator.concat, self.get_reply().values())
 
+    async def await_injections_async(self):
+        await self.wait_for_reply_async()
+        return reduce(operator.concat, self.get_reply().values())
+
 class InjectionDispatcher(Component, BaseNamedInjectable):
-    def __init__(self) -> None:
-        super(Component, self).__init__()
-        super(BaseNamedInjectable, self).__init__()
-        self._injectables = set() 
+    """ Replies to injection events with the added injectables matching the query. Injectables are indexed by their names and by every 
+    class in the MRO of their types, so a query is a dictionary lookup. The name of an injectable must not change while it is added 
+    """
+    def __init__(self, injectable_name = 'injection_dispatcher') -> None:
+        Component.__init__(self)
+        BaseNamedInjectable.__init__(self, injectable_name)
+        self._injectables = set()
+        self._injectables_by_name: dict[str, tuple] = {}
+        self._injectables_by_type: dict[type, tuple] = {}
+        self._injectables_lock = threading.Lock() # Held while changing the indices. The indices hold tuples that are replaced on changes, so reading doesn't need the lock
+        self._generation = 0 # Incremented whenever an injectable is added or removed
 
     def add_injectable(self, injectable):
-        self._injectables.add(injectable)
+        with self._injectables_lock:
+            if injectable in self._injectables:
+                return
+            self._injectables.add(injectable)
+            if isinstance(injectable, AbstractNamedInjectable):
+                name = injectable.get_injectable_name()
+                self._injectables_by_name[name] = self._injectables_by_name.get(name, ()) + (injectable,)
+            for i in type(injectable).__mro__:
+                self._injectables_by_type[i] = self._injectables_by_type.get(i, ()) + (injectable,)
+            self._generation += 1
+
+    def remove_injectable(self, injectable):
+        """ Removes the injectable. Raises KeyError if it had not been added """
+        with self._injectables_lock:
+            self._injectables.remove(injectable)
+            if isinstance(injectable, AbstractNamedInjectable):
+                _remove_indexed(self._injectables_by_name, injectable.get_injectable_name(), injectable)
+            for i in type(injectable).__mro__:
+                _remove_indexed(self._injectables_by_type, i, injectable)
+            self._generation += 1
 
     def injectables_iter(self):
         return iter(self._injectables)
 
+    def get_generation(self) -> int:
+        """ Returns a number that changes whenever an injectable is added or removed """
+        return self._generation
+
+    def find_injectables(self, query: Union[str, type]) -> list:
+        """ Returns the injectables matching the query: the ones of the type if the query is a type, the named ones of the name if it is 
+        a string 
+        """
+        if isinstance(query, type):
+            return list(self._injectables_by_type.get(query, ()))
+        elif isinstance(query, str):
+            return list(self._injectables_by_name.get(query, ()))
+        else:
+            raise TypeError(f'{self} received injection query {query} of type {type(query)}, but only "str" and "type" are allowed types')
+
+    def get_handled_event_types(self) -> tuple[type]:
+        return (InjectionEvent,)
+
     def on_event(self, reactor, event: Event) -> None:
-        ret = set()
         if isinstance(event, InjectionEvent):
-            if isinstance(event.injection_query, type):
-                for i in self._injectables:
-                    if isinstance(i, event.injection_query):
-                        ret.add(i)
-            elif isinstance(event.injection_query, str):
-                for i in self._injectables:
-                    if isinstance(i, AbstractNamedInjectable) and i.get_injectable_name() == event.injection_query:
-                        ret.add(i)
-            else:
-                raise TypeError(f'{self} received injection event {event} with query {event.injection_query} of type f{type(event.injection_query)}, but only "str" and "type " are allowed types')
-                        
\ No newline at end of file
+            reply = Future() # Resolved right away as the lookup is cheap, so the reply doesn't take a thread of the reactor
+            reply.set_result(self.find_injectables(event.injection_query))
+            event.reply(self, reply)
+
+def _remove_indexed(index: dict, key, injectable):
+    remaining = tuple(i for i in index[key] if i is not injectable)
+    if len(remaining) > 0:
+        index[key] = remaining
+    else:
+        del index[key]
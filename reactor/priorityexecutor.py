@@ -0,0 +1,95 @@
+import atexit
+from concurrent.futures import Executor, Future
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Callable
+import weakref
+from reactor.event import Priorities
+
+_executors = weakref.WeakSet() # Executors that have not been shut down, they are shut down at exit
+
+def _shutdown_executors_at_exit():
+    for i in list(_executors):
+        i.shutdown(wait=True)
+
+# The workers are daemon threads so that they don't keep the interpreter alive, but like the workers of "ThreadPoolExecutor" they are 
+# let to run the submitted callbacks before exiting
+atexit.register(_shutdown_executors_at_exit)
+
+class PriorityThreadPoolExecutor(Executor):
+    """ Thread pool that runs the submitted callbacks in the order of their priorities (see "Priorities" class in reactor.event) instead
+    of the order of submitting. Callbacks of the same priority are run in the order of submitting.
+
+    To keep lower priority callbacks from starving, every callback gets a virtual deadline: the time it was submitted plus its priority
+    times "aging_interval" seconds. Callbacks are run in the order of their deadlines, so a callback waits behind callbacks of a higher
+    priority for no more than "aging_interval" seconds per priority level between them
+    """
+    def __init__(self, max_workers: int = None, aging_interval: float = 0.05, thread_name_prefix: str = 'PriorityThreadPoolExecutor') -> None:
+        self._max_workers = min(32, (os.cpu_count() or 1) + 4) if max_workers is None else max_workers
+        self._aging_interval = aging_interval
+        self._thread_name_prefix = thread_name_prefix
+        self._queue = [] # Heap of (deadline, sequence number, future, callback, args, kwargs)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._idle_workers_count = 0
+        self._shutdown = False
+        _executors.add(self)
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        return self.submit_with_priority(Priorities.NORMAL, fn, *args, **kwargs)
+
+    def submit_with_priority(self, priority: int, fn: Callable, /, *args, **kwargs) -> Future:
+        future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError('Cannot schedule new callbacks after shutdown')
+
+            deadline = time.monotonic() + priority * self._aging_interval
+            heapq.heappush(self._queue, (deadline, next(self._sequence), future, fn, args, kwargs))
+
+            if self._idle_workers_count > 0:
+                self._idle_workers_count -= 1 # Counted off here rather than by the woken worker so that the next submit doesn't count on it
+                self._condition.notify()
+            elif len(self._threads) < self._max_workers:
+                thread = threading.Thread(target=self._work, name=f'{self._thread_name_prefix}_{len(self._threads)}', daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        _executors.discard(self)
+        with self._condition:
+            self._shutdown = True
+            if cancel_futures:
+                for i in self._queue:
+                    i[2].cancel()
+                self._queue.clear()
+            self._condition.notify_all()
+
+        if wait:
+            for i in self._threads:
+                i.join()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while len(self._queue) == 0 and not self._shutdown:
+                    self._idle_workers_count += 1
+                    self._condition.wait()
+
+                if len(self._queue) == 0:
+                    return
+                _, _, future, fn, args, kwargs = heapq.heappop(self._queue)
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
@@ -1,24 +1,76 @@
 from asyncio import wait_for
 from collections import OrderedDict
-from concurrent.futures import Future, wait
+from concurrent.futures import CancelledError, Future, TimeoutError, as_completed, wait # Until Python 3.11 the timeout isn't the builtin one
+from functools import partial
+import asyncio
 import threading
-from typing import Any
+import time
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Optional
 from reactor.event import EmittedFlagBlockingEvent, Event
 
 from reactor.component import Component
 
 class ReturningEvent(Event):
-    def __init__(self, source_component) -> None:
+    """ A timeout can be given to the event when creating it or by "set_timeout" before emitting it. Once the deadline passes waiting 
+    for the replies stops, the unresolved replies are cancelled (if they are not running yet) and only the resolved ones can be read 
+    """
+    def __init__(self, source_component, timeout: float = None) -> None:
         super().__init__(source_component)
+        self._deadline = None
+        self.set_timeout(timeout)
+
+    def set_timeout(self, timeout: Optional[float]) -> None:
+        """ Sets the deadline of the event to "timeout" seconds from now. None removes the deadline """
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+
+    def get_remaining_time(self) -> Optional[float]:
+        """ Returns seconds left until the deadline, or None if the event has no deadline """
+        return None if self._deadline is None else max(0, self._deadline - time.monotonic())
+
+    def is_expired(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
 
     def wait_for_reply(self) -> None:
         """ Sleeps the current thread until the event is replied """
         pass
 
+    async def wait_for_reply_async(self) -> None:
+        """ Awaitable counterpart of "wait_for_reply". Suspends the awaiting coroutine instead of sleeping the thread """
+        pass
+
     def is_replied(self) -> bool:
         """ Returns if all replies have been resolved """
         pass
 
+def _cancel_expired(event: ReturningEvent, replies: Iterable[Future]) -> None:
+    if event.is_expired():
+        for i in replies:
+            if not i.done():
+                i.cancel()
+
+def _wait_until_deadline(event: ReturningEvent, replies: Iterable[Future]) -> None:
+    if event._emit_completed.wait(event.get_remaining_time()):
+        wait(list(replies), event.get_remaining_time())
+    _cancel_expired(event, list(replies))
+
+async def _wait_until_deadline_async(event: ReturningEvent, replies: Iterable[Future]) -> None:
+    async def wait_for_all():
+        await event.wait_for_emit_completed_async()
+        await asyncio.gather(*(asyncio.wrap_future(i) for i in list(replies)), return_exceptions=True)
+    try:
+        await asyncio.wait_for(wait_for_all(), event.get_remaining_time())
+    except asyncio.TimeoutError:
+        pass
+    _cancel_expired(event, list(replies))
+
+def _copy_future_state(source: Future, destination: Future) -> None:
+    if source.cancelled():
+        destination.set_exception(CancelledError())
+    elif source.exception() is not None:
+        destination.set_exception(source.exception())
+    else:
+        destination.set_result(source.result())
+
 class ParallelReturningException(Exception):
     def __init__(self, replied_exceptions: list[Exception], *args: object) -> None:
         super().__init__(*args)
@@ -29,13 +81,15 @@ class ParallelReturningEvent(ReturningEvent, EmittedFlagBlockingEvent):
     """ Sends this event to whatever amount of components will reply to it. Replies are futures. When all the replies resolve you can 
     get the values of the replies and components corresponding to their reply 
     """
-    def __init__(self, source_component) -> None:
-        super().__init__(source_component)
+    def __init__(self, source_component, timeout: float = None) -> None:
+        super().__init__(source_component, timeout)
         self._replies: dict[Component, Future] = {}
 
     def wait_for_reply(self) -> None:
-        self._emit_completed.wait()
-        wait(self._replies.values())
+        _wait_until_deadline(self, self._replies.values())
+
+    async def wait_for_reply_async(self) -> None:
+        await _wait_until_deadline_async(self, self._replies.values())
 
     def is_replied(self) -> bool:
         """ Returns True if the event has completed emitting and each of the replies is either finished with a result or cancelled. 
@@ -47,7 +101,7 @@ class ParallelReturningEvent(ReturningEvent, EmittedFlagBlockingEvent):
 
         for i in self._replies.values():
             if i.done():
-                if i.exception(0) != None:
+                if not i.cancelled() and i.exception(0) != None:
                     replied_exceptions.append(i.exception(0))
             else:
                 are_done = False
@@ -60,20 +114,23 @@ class ParallelReturningEvent(ReturningEvent, EmittedFlagBlockingEvent):
             return False
             
     def get_reply(self) -> dict[Component, Any]:
-        """ Returns the replies mapped to their component-repliers. The event must be replied (is_replied() must return True). If one 
-        of the replies has finished with an exception then raises parallel returning exception, containing exceptions raised by all 
-        replies that finished with an exception
+        """ Returns the replies mapped to their component-repliers. The event must be replied (is_replied() must return True) or expired, 
+        in the latter case only the resolved replies are returned. If one of the replies has finished with an exception then raises 
+        parallel returning exception, containing exceptions raised by all replies that finished with an exception
         """
+        is_expired = self.is_expired()
         ret = {}
         replied_exceptions = []
 
         for k, v in self._replies.items():
             if v.done():
-                if v.exception(0) != None:
+                if v.cancelled():
+                    continue
+                elif v.exception(0) != None:
                     replied_exceptions.append(v.exception(0))
-                elif not v.cancelled():
+                else:
                     ret[k] = v.result(0)
-            else:
+            elif not is_expired:
                 raise RuntimeError('A reply has not finished while trying to get final dictionary of replies')
         
         if len(replied_exceptions) > 0:
@@ -81,44 +138,143 @@ class ParallelReturningEvent(ReturningEvent, EmittedFlagBlockingEvent):
         else:
             return ret
 
+    def wait_for_quorum(self, count: int, cancel_others: bool = False) -> dict[Component, Any]:
+        """ Waits for the event to complete emitting and for the first "count" replies that finish with a result, then returns them mapped 
+        to their component-repliers. If "cancel_others" is True the rest of the replies are cancelled (only the ones that haven't 
+        started running can be cancelled). If fewer than "count" replies finish with a result then raises parallel returning exception, 
+        containing exceptions raised by the replies that finished with an exception. The same happens if the deadline passes first 
+        """
+        self._emit_completed.wait(self.get_remaining_time())
+        components = {v: k for k, v in self._replies.items()}
+        ret = {}
+        replied_exceptions = []
+
+        if count > 0:
+            try:
+                for i in as_completed(components.keys(), self.get_remaining_time()):
+                    if i.cancelled():
+                        continue
+                    elif i.exception() != None:
+                        replied_exceptions.append(i.exception())
+                    else:
+                        ret[components[i]] = i.result()
+                        if len(ret) >= count:
+                            break
+            except TimeoutError:
+                _cancel_expired(self, components.keys())
+
+        if len(ret) < count:
+            raise ParallelReturningException(replied_exceptions, f'Only {len(ret)} of {count} required replies finished with a result')
+        if cancel_others:
+            for i in components.keys():
+                i.cancel()
+        return ret
+
+    def wait_for_first(self, cancel_others: bool = False) -> tuple[Component, Any]:
+        """ Waits for the first reply that finishes with a result and returns it as (component, result). Passing True as 
+        "cancel_others" races the replies: the ones that haven't started running when the winner is known are cancelled. See 
+        "wait_for_quorum" 
+        """
+        return next(iter(self.wait_for_quorum(1, cancel_others).items()))
+
+    def replies_as_completed(self) -> Iterator[tuple[Component, Any]]:
+        """ Waits for the event to complete emitting, then yields the replies as (component, result) pairs in the order they resolve. If 
+        a reply has finished with an exception then the exception is raised when the iteration reaches it, and the iteration can go on 
+        with the next replies. Cancelled replies are skipped. If the deadline passes the unresolved replies are cancelled and 
+        "TimeoutError" of "concurrent.futures" is raised 
+        """
+        return _RepliesAsCompleted(self)
+
+    def replies_as_completed_async(self) -> AsyncIterator[tuple[Component, Any]]:
+        """ Asynchronous counterpart of "replies_as_completed" """
+        return _RepliesAsCompletedAsync(self)
+
     def reply(self, replying_component: Component, future: Future) -> None:
         if replying_component in self._replies.keys():
             raise RuntimeError("A component tried replying twice to a parallel returning event")
         else:
             self._replies[replying_component] = future
 
-# class SequentialReturningEvent(ReturningEvent, EmittedFlagBlockingEvent):
-#     class _ReplyEntry:
-#         def __init__(self, previous, component, reply_future) -> None:
-#             self.previous = previous
-#             self.component = component
-#             self.reply_future = reply_future
-    
-#     def __init__(self, source_component) -> None:
-#         super().__init__(source_component)
-#         self._last_reply = None
-    
-#     def wait_for_reply(self) -> None:
-#         ...
+class _RepliesAsCompleted:
+    """ Iterator of "replies_as_completed". Not a generator, as raising the exception of a reply would end a generator """
+    def __init__(self, event: ParallelReturningEvent) -> None:
+        self._event = event
+        self._components = None
+        self._futures = None
+
+    def __iter__(self) -> '_RepliesAsCompleted':
+        return self
+
+    def __next__(self) -> tuple[Component, Any]:
+        event = self._event
+        if self._futures is None:
+            event._emit_completed.wait(event.get_remaining_time())
+            self._components = {v: k for k, v in event._replies.items()}
+            self._futures = as_completed(self._components.keys(), event.get_remaining_time())
+
+        while True:
+            try:
+                i = next(self._futures)
+            except TimeoutError:
+                _cancel_expired(event, self._components.keys())
+                raise
+            if not i.cancelled():
+                return (self._components[i], i.result())
 
-#     def is_replied(self) -> bool:
-#         ...
+class _RepliesAsCompletedAsync:
+    """ Asynchronous iterator of "replies_as_completed_async" """
+    def __init__(self, event: ParallelReturningEvent) -> None:
+        self._event = event
+        self._components = None
+        self._pending = None
+        self._done = []
 
-#     def wait_for_previous(self, ):
-#         ...
+    def __aiter__(self) -> '_RepliesAsCompletedAsync':
+        return self
 
+    async def __anext__(self) -> tuple[Component, Any]:
+        event = self._event
+        if self._pending is None:
+            await event.wait_for_emit_completed_async()
+            self._components = {asyncio.wrap_future(v): k for k, v in event._replies.items()}
+            self._pending = set(self._components.keys())
+
+        while True:
+            while len(self._done) > 0:
+                i = self._done.pop()
+                if not i.cancelled():
+                    return (self._components[i], i.result())
+
+            if len(self._pending) == 0:
+                raise StopAsyncIteration()
+            done, self._pending = await asyncio.wait(self._pending, timeout=event.get_remaining_time(), return_when=asyncio.FIRST_COMPLETED)
+            if len(done) == 0:
+                _cancel_expired(event, event._replies.values())
+                raise TimeoutError()
+            self._done.extend(done)
+
+class _ReplyEntry:
+    """ Reply of a sequential returning event, linked to the reply made before it """
+    def __init__(self, previous, component, reply_future) -> None:
+        self.previous: Optional[_ReplyEntry] = previous
+        self.component = component
+        self.reply_future: Future = reply_future
 
-# if False: # Used instead of comment so that the code below is colored
 class SequentialReturningEvent(ReturningEvent, EmittedFlagBlockingEvent):
-    def __init__(self, source_component) -> None:
-        super().__init__(source_component)
+    def __init__(self, source_component, timeout: float = None) -> None:
+        super().__init__(source_component, timeout)
         self._replies: OrderedDict[Component, Future] = OrderedDict()
+        self._entries: dict[Component, _ReplyEntry] = {}
+        self._last_entry: Optional[_ReplyEntry] = None
         self._replies_lock = threading.Lock()
 
     def wait_for_reply(self) -> None:
         """ Waits for the final result """
-        self._emit_completed.wait()
-        wait(self._replies.values())
+        _wait_until_deadline(self, self._replies.values())
+
+    async def wait_for_reply_async(self) -> None:
+        """ Awaits the final result """
+        await _wait_until_deadline_async(self, self._replies.values())
 
     def is_replied(self) -> bool:
         """ Returns True if the event has completed emitting and each of the replies is either finished with a result or cancelled. 
@@ -130,7 +286,7 @@ class SequentialReturningEvent(ReturningEvent, EmittedFlagBlockingEvent):
 
         for i in self._replies.values():
             if i.done():
-                if i.exception(0) != None:
+                if not i.cancelled() and i.exception(0) != None:
                     replied_exceptions.append(i.exception(0))
             else:
                 are_done = False
@@ -146,46 +302,82 @@ class SequentialReturningEvent(ReturningEvent, EmittedFlagBlockingEvent):
         """ Returns the most recent currently resolved reply value mapped to its component. If the previous reply finishes with an exception then 
         the method raises the exception 
         """
-        # TODO: Probably needs to have the self._replies synchronized  
-        for k in reversed(self._replies.keys()):
-            v = self._replies[k] 
+        entry = self._last_entry
+        while entry is not None:
+            v = entry.reply_future
             if v.done() and not v.cancelled():
                 if v.exception(0) != None:
                     raise v.exception(0)
-                return (k, v.result(0))
+                return (entry.component, v.result(0))
+            entry = entry.previous
         return if_no_replies
 
+    def _previous_uncancelled_entry(self, component) -> Optional[_ReplyEntry]:
+        with self._replies_lock:
+            entry = self._entries.get(component)
+            entry = self._last_entry if entry is None else entry.previous
+        while entry is not None and entry.reply_future.cancelled():
+            entry = entry.previous
+        return entry
+
     def previous_entry(self, component, if_no_replies = None) -> Any:
-        """ Returns reply future of the previously replied component mapped to the component. If it finishes with an exception the the method 
-        raises the exception. 
+        """ Returns reply future of the previously replied component mapped to the component, as (component, future). 
         
         The "component" argument is the component calling the method. Specifying a different component you are risking to cause a deadlock. 
         """
-        ret = if_no_replies
-        with self._replies_lock:
-            if len(self._replies) > 0:
-                index = (list(self._replies.keys()).index(component) - 1) if component in self._replies.keys() else len(self._replies) - 1
-                for i in range(index, 0, -1):
-                    if not list(self._replies.values())[i].cancelled():
-                        ret = (list(self._replies.keys())[i], list(self._replies.values())[i],)
-                        break
-        return (None, ret,)
+        entry = self._previous_uncancelled_entry(component)
+        return if_no_replies if entry is None else (entry.component, entry.reply_future,)
 
     def previous_reply(self, component, if_no_replies = None) -> Any:
         """ Awaits reply result of the previously replied component. If it finishes with an exception the the method 
-        raises the exception. 
+        raises the exception. If the deadline of the event (see "set_timeout") passes while awaiting, "TimeoutError" of 
+        "concurrent.futures" is raised. 
         
         The "component" argument is the component calling the method. Specifying a different component you are risking to cause a deadlock. 
         """
-        with self._replies_lock:
-            ret = if_no_replies
-            if len(self._replies) > 0:
-                index = (list(self._replies.keys()).index(component) - 1) if component in self._replies.keys() else len(self._replies) - 1
-                for i in range(index, -1, -1):
-                    if not list(self._replies.values())[i].cancelled():
-                        ret = list(self._replies.values())[i].result()
-                        break
-            return ret
+        entry = self._previous_uncancelled_entry(component)
+        return if_no_replies if entry is None else entry.reply_future.result(self.get_remaining_time())
+
+    def reply_after_previous(self, replying_component: Component, reactor, callback: Callable[[Any], Any], if_no_replies = None, inline: bool = False) -> Future:
+        """ Replies with a future of "callback" called with the result of the previous reply (or with "if_no_replies" if there is none). 
+        Unlike calling "previous_reply" from a callback run by the reactor, the callback is only run (with "run_async" of the reactor) 
+        after the previous reply resolves, so no thread is waiting for it. If "inline" is True the callback is run right away by the 
+        thread that finds the previous reply resolved instead (the replying thread or the one resolving the previous reply), use it for 
+        quick callbacks. If the previous reply finishes with an exception then the reply finishes with the same exception without 
+        running the callback. The callback can be a coroutine function if the reactor runs coroutine functions (like "AsyncReactor" 
+        does), such a callback is always run by the reactor. Returns the reply future 
+        """
+        future = Future()
+        inline = inline and not asyncio.iscoroutinefunction(callback)
+
+        def run(previous_result):
+            if not future.set_running_or_notify_cancel():
+                return
+            elif inline:
+                try:
+                    future.set_result(callback(previous_result))
+                except BaseException as e:
+                    future.set_exception(e)
+            else:
+                reactor.run_async(partial(callback, previous_result), self.priority).add_done_callback(lambda f: _copy_future_state(f, future))
+
+        def run_after(entry: Optional[_ReplyEntry]):
+            while entry is not None and entry.reply_future.cancelled():
+                entry = entry.previous
+
+            if entry is None:
+                run(if_no_replies)
+            elif not entry.reply_future.done():
+                entry.reply_future.add_done_callback(lambda _: run_after(entry))
+            elif entry.reply_future.exception() is not None:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(entry.reply_future.exception())
+            else:
+                run(entry.reply_future.result())
+
+        self.reply(replying_component, future)
+        run_after(self._entries[replying_component].previous)
+        return future
 
     def reply(self, replying_component: Component, future: Future) -> None:
         """ Adds a reply. If the event has finished replying then this 
@@ -200,6 +392,5 @@ class SequentialReturningEvent(ReturningEvent, EmittedFlagBlockingEvent):
             elif replying_component in self._replies.keys():
                 raise RuntimeError("A component tried replying twice to a sequential returning event")
             else:
-                if len(self._replies) >= 1 and list(self._replies.values())[-1].running(): 
-                    list(self._replies.values())[-1].cancel()
+                self._last_entry = self._entries[replying_component] = _ReplyEntry(self._last_entry, replying_component, future)
                 self._replies[replying_component] = future
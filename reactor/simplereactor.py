@@ -1,8 +1,12 @@
-from concurrent.futures import Future, ThreadPoolExecutor
-from typing import Iterator
-from reactor.component import Component
+from concurrent.futures import Future, ProcessPoolExecutor
+import logging
+from queue import Empty, Full, Queue
+import threading
+from typing import Iterator, Optional
+from reactor.component import Component, ComponentContainer
 from reactor.injection import InjectionEvent, InjectionDispatcher
-from reactor.returningevent import Event
+from reactor.event import Event, Priorities
+from reactor.priorityexecutor import PriorityThreadPoolExecutor
 from reactor.fabrication import FactoryDistributor
 from reactor.abstractreactor import AbstractReactor
 from reactor.transformation import TransformationDistributor, TransformEvent
@@ -12,10 +16,32 @@ class TransformationModes:
     ONLY_DISTRIBUTOR = 1 # Emit transformation event only to the transformation distributor singleton of the reactor
     ALL = 2 # Emit transformation event to all components of the reactor
 
+class QueueFullPolicies:
+    BLOCK = 0 # Wait until the queue has free space
+    DROP_OLDEST = 1 # Drop the event that has been in the queue the longest and queue the new one
+    DROP_NEWEST = 2 # Drop the new event
+    RAISE = 3 # Raise "queue.Full"
+
 class SimpleReactor(AbstractReactor):
-    def __init__(self):
+    def __init__(self, max_threads: int = None, max_processes: int = None, queue_size: int = 1024, queue_full_policy = QueueFullPolicies.BLOCK, dispatcher_threads: int = 1, aging_interval: float = 0.05, cache_injections: bool = True):
         self._components: list[Component] = []
-        self._thread_pool = ThreadPoolExecutor()
+        self._subscribers: dict[type, list[Component]] = {} # Event type mapped to the components that handle it, filled lazily by "get_subscribers"
+        self._has_top_level_transformers = None # Cached result of checking the subscribers of transform event, reset with the subscribers
+        self._skipped_transformations_count = 0
+        self._thread_pool = PriorityThreadPoolExecutor(max_threads, aging_interval)
+        self._delivery_state = threading.local() # Holds the priority of the event being delivered by the thread
+        self._process_pool = None # Created on the first "run_in_process" call
+        self._process_pool_lock = threading.Lock()
+        self._max_processes = max_processes
+        self._event_queue = Queue(queue_size)
+        self._queue_full_policy = queue_full_policy
+        self._dispatcher_threads_count = dispatcher_threads
+        self._dispatcher_threads = None # Started on the first "emit_nowait" call
+        self._dispatcher_threads_lock = threading.Lock()
+        self._dropped_events_count = 0
+        self._cache_injections_enabled = cache_injections
+        self._injection_cache: dict = {} # Injection query mapped to (cache key, injections)
+        self._components_generation = 0 # Incremented whenever a component is added (also to a distributor), as it may reply to injection events
         self._injection_dispatcher = InjectionDispatcher()
         self._factory_distributor = FactoryDistributor()
         self._transformation_distributor = TransformationDistributor()
@@ -23,6 +49,8 @@ class SimpleReactor(AbstractReactor):
         self._components.append(self._injection_dispatcher)
         self._components.append(self._factory_distributor)
         self._components.append(self._transformation_distributor)
+        self._factory_distributor.add_components_listener(self._on_nested_component_added)
+        self._transformation_distributor.add_components_listener(self._on_nested_component_added)
 
         self._injection_dispatcher.add_injectable(self._injection_dispatcher)
         self._injection_dispatcher.add_injectable(self._factory_distributor)
@@ -30,12 +58,101 @@ class SimpleReactor(AbstractReactor):
 
     def add_component(self, component):
         self._components.append(component)
+        self._subscribers = {}
+        self._has_top_level_transformers = None
+        self._components_generation += 1
+        if isinstance(component, ComponentContainer):
+            component.add_components_listener(self._on_nested_component_added)
+
+    def _on_nested_component_added(self, component):
+        self._components_generation += 1
+
+    def get_subscribers(self, event_type: type) -> list[Component]:
+        """ Returns the components (in the order they were added) that the reactor delivers events of the given type to. See 
+        "get_handled_event_types" method of "Component" 
+        """
+        subscribers = self._subscribers
+        ret = subscribers.get(event_type)
+        if ret is None:
+            ret = []
+            for i in self._components:
+                handled_event_types = i.get_handled_event_types()
+                if handled_event_types is None or issubclass(event_type, handled_event_types):
+                    ret.append(i)
+            subscribers[event_type] = ret
+        return ret
+
+    def has_transformers(self, transformation_mode = TransformationModes.ALL) -> bool:
+        """ Returns if a transform event emitted in the given transformation mode can reach a component that may reply to it. When it can't 
+        the reactor delivers events directly, without emitting the transform event 
+        """
+        if self._transformation_distributor.get_components_count() > 0:
+            return True
+        elif transformation_mode == TransformationModes.ALL:
+            if self._has_top_level_transformers is None:
+                self._has_top_level_transformers = any(i is not self._transformation_distributor for i in self.get_subscribers(TransformEvent))
+            return self._has_top_level_transformers
+        else:
+            return False
+
+    def get_skipped_transformations_count(self) -> int:
+        """ Returns how many emits skipped emitting the transform event because there were no transformers. The count is approximate if the 
+        reactor is emitted to from multiple threads simultaneously 
+        """
+        return self._skipped_transformations_count
 
     def components_iter(self) -> Iterator:
         return iter(self._components)
 
-    def run_async(self, callback):
-        return self._thread_pool.submit(callback)
+    def run_async(self, callback, priority: int = None):
+        if priority is None:
+            priority = getattr(self._delivery_state, 'priority', Priorities.NORMAL)
+        return self._thread_pool.submit_with_priority(priority, callback)
+
+    def run_in_process(self, callback, *args):
+        if self._process_pool is None:
+            with self._process_pool_lock:
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(self._max_processes)
+        return self._process_pool.submit(callback, *args)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        """ Shuts down the thread pool and the process pool of the reactor, after which callbacks can't be run by it. If "wait" is True 
+        the events queued with "emit_nowait" are emitted first and the method returns when the callbacks already submitted have been run, 
+        unless "cancel_futures" is True, then the callbacks that haven't started running are cancelled. Thread pools of reactors that 
+        are not shut down are shut down (with waiting) at exit 
+        """
+        if wait and self._dispatcher_threads is not None:
+            self._event_queue.join()
+        self._thread_pool.shutdown(wait, cancel_futures=cancel_futures)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait, cancel_futures=cancel_futures)
+
+    def find_injectable(self, query, injectable_chooser = lambda l: l[0]):
+        """ Returns the injectable chosen from the ones the injection dispatcher of the reactor has for the query. Unlike "get_injectable" 
+        doesn't emit an injection event, so only injectables added to the injection dispatcher are found 
+        """
+        return injectable_chooser(self._injection_dispatcher.find_injectables(query))
+
+    def clear_injection_cache(self):
+        """ Forgets the cached results of "get_injectable". Call it if a component replies to injection events with injectables that 
+        change without adding or removing injectables to the injection dispatcher (injections are cached only if "cache_injections" is 
+        True when creating the reactor) 
+        """
+        self._injection_cache = {}
+
+    def _get_injection_cache_key(self):
+        return (self._components_generation, self._injection_dispatcher.get_generation())
+
+    def _get_cached_injections(self, query):
+        cached = self._injection_cache.get(query)
+        if cached is not None and cached[0] == self._get_injection_cache_key():
+            return cached[1]
+        return None
+
+    def _cache_injections(self, query, cache_key, injections):
+        if self._cache_injections_enabled:
+            self._injection_cache[query] = (cache_key, injections)
 
     def get_injection_dispatcher(self) -> InjectionDispatcher:
         return self._injection_dispatcher
@@ -46,30 +163,109 @@ class SimpleReactor(AbstractReactor):
     def get_transformation_distributor(self) -> TransformationDistributor:
         return self._transformation_distributor
 
-    def emit(self, event: Event):
-        self.emit(event, TransformationModes.ALL)
+    def emit(self, event: Event, transformation_mode = TransformationModes.ALL):
+        transform_event = self._emit_transform_event(event, transformation_mode)
+        if transform_event is not None:
+            transform_event.wait_for_reply()
+            event = transform_event.previous_reply(None, event)
+        self._deliver(event)
 
-    def emit(self, event: Event, transformation_mode):
-        if transformation_mode == 2:
-            transform_event = TransformEvent(None, event)
+    def emit_nowait(self, event: Event, transformation_mode = TransformationModes.ALL) -> bool:
+        """ Puts the event into the reactor's bounded event queue and returns without waiting for the event to be delivered. The queue 
+        is drained by dispatcher threads that emit the events in the order they were queued (unless there are multiple dispatcher 
+        threads). When the queue is full the queue full policy of the reactor is applied (see "QueueFullPolicies" class in 
+        reactor.simplereactor). Returns False if the event has been dropped. A dropped event is marked as emit completed without 
+        being delivered, so whatever waits for its replies gets none instead of waiting forever 
+        """
+        if self._dispatcher_threads is None:
+            self._start_dispatcher_threads()
 
-            for i in self._components:
-                i.on_event(self, transform_event) 
-            transform_event.on_emit_completed()    
-            
-            transform_event.wait_for_reply()
-            event = transform_event.previous_reply(None)
+        if self._queue_full_policy == QueueFullPolicies.BLOCK:
+            self._event_queue.put((event, transformation_mode))
+        elif self._queue_full_policy == QueueFullPolicies.RAISE:
+            self._event_queue.put_nowait((event, transformation_mode))
+        elif self._queue_full_policy == QueueFullPolicies.DROP_NEWEST:
+            try:
+                self._event_queue.put_nowait((event, transformation_mode))
+            except Full:
+                self._drop_event(event)
+                return False
+        elif self._queue_full_policy == QueueFullPolicies.DROP_OLDEST:
+            while True:
+                try:
+                    self._event_queue.put_nowait((event, transformation_mode))
+                    break
+                except Full:
+                    try:
+                        self._drop_event(self._event_queue.get_nowait()[0])
+                        self._event_queue.task_done()
+                    except Empty:
+                        pass
+        else:
+            raise ValueError(f'Queue full policy can only be a value in range [0, 3]. But {self._queue_full_policy} was given. See "QueueFullPolicies" class in reactor.simplereactor')
+        return True
+
+    def wait_for_queued_events(self):
+        """ Sleeps the current thread until every event queued with "emit_nowait" has been emitted """
+        self._event_queue.join()
+
+    def get_dropped_events_count(self) -> int:
+        return self._dropped_events_count
+
+    def _drop_event(self, event: Event):
+        self._dropped_events_count += 1
+        event.on_emit_completed()
+
+    def _start_dispatcher_threads(self):
+        with self._dispatcher_threads_lock:
+            if self._dispatcher_threads is None:
+                threads = [threading.Thread(target=self._dispatch_queued_events, name=f'SimpleReactor dispatcher {i}', daemon=True) for i in range(self._dispatcher_threads_count)]
+                for i in threads:
+                    i.start()
+                self._dispatcher_threads = threads
+
+    def _dispatch_queued_events(self):
+        while True:
+            event, transformation_mode = self._event_queue.get()
+            try:
+                self.emit(event, transformation_mode)
+            except Exception:
+                logging.getLogger(__name__).exception(f'Emitting queued event {event} failed')
+            finally:
+                self._event_queue.task_done()
+
+    def _emit_transform_event(self, event: Event, transformation_mode) -> Optional[TransformEvent]:
+        """ Emits the transform event for the event according to the transformation mode. Returns the transform event, or None if it 
+        was not emitted 
+        """
+        if transformation_mode in (1, 2) and not self.has_transformers(transformation_mode):
+            self._skipped_transformations_count += 1
+            return None
+        elif transformation_mode == 2:
+            transform_event = TransformEvent(None, event)
+            self._deliver_to(self.get_subscribers(TransformEvent), transform_event)
+            return transform_event
         elif transformation_mode == 1:
-            self._transformation_distributor.on_event(self, transform_event := TransformEvent(None, event))
-            
-            transform_event.wait_for_reply()
-            event = transform_event.previous_reply(None)
+            transform_event = TransformEvent(None, event)
+            self._deliver_to((self._transformation_distributor,), transform_event)
+            return transform_event
         elif transformation_mode == 0:
-            pass
+            return None
         else:
             raise ValueError(f'Transformation mode can only be a value in range [0, 2]. But {transformation_mode} was given. See "TransformationModes" class in reactor.simplereactor')
 
-        for i in self._components:
-            i.on_event(self, event) 
-        event.on_emit_completed()  
+    def _deliver(self, event: Event):
+        self._deliver_to(self.get_subscribers(type(event)), event)
 
+    def _deliver_to(self, components, event: Event):
+        """ Passes the event to the components and completes its emitting. Callbacks the components run while handling the event get the 
+        priority of the event 
+        """
+        previous_priority = getattr(self._delivery_state, 'priority', None)
+        self._delivery_state.priority = event.priority
+        try:
+            for i in components:
+                i.on_event(self, event) 
+        finally:
+            self._delivery_state.priority = previous_priority
+        event.on_emit_completed()
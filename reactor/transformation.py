@@ -7,15 +7,19 @@ class TransformEvent(SequentialReturningEvent):
     def __init__(self, source_component, event: Event) -> None:
         super().__init__(source_component)
         self.event = event
+        self.priority = event.priority
 
 class TransformationDistributor(Distributor, BaseNamedInjectable):
-    def __init__(self, injectable_name = 'factory_distributor') -> None:
-        super(Distributor, self).__init__()
-        super(BaseNamedInjectable, self).__init__(injectable_name)
+    def __init__(self, injectable_name = 'transformation_distributor') -> None:
+        Distributor.__init__(self)
+        BaseNamedInjectable.__init__(self, injectable_name)
 
     def must_handle_event(self, reactor, event: Event) -> bool:
         return isinstance(event, TransformEvent)
 
+    def get_handled_event_types(self) -> tuple[type]:
+        return (TransformEvent,)
+
     def get_injectable_name(self) -> str:
         return self._injectable_name
 
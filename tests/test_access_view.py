@@ -1,5 +1,7 @@
-from reactor.data.accessview import AccessView
-from reactor.data.accessview import ALL_PUBLIC, AccessConfig
+from array import array
+from reactor.data.accessview import AccessView, ColumnarAccessView, compiled_access_view
+from reactor.data.accessview import ALL_PUBLIC, UNDERSCORE_PRIVATE, AccessConfig
+import re
 import pytest as pt
 
 class DogModel:
@@ -38,3 +40,119 @@ def test_access_view():
         print(dog_view.name)
     with pt.raises(AttributeError):
         del dog_view.name
+
+def test_access_config_decisions():
+    access_config = AccessConfig({
+        **ALL_PUBLIC,
+        **UNDERSCORE_PRIVATE,
+        re.compile(r'owner_\w+'): '!w',
+        re.compile(r'(\w)\1'): '!r',
+        'owner_name': 'w',
+    })
+
+    assert access_config.can_read('age')
+    assert not access_config.can_read('_age')
+    assert not access_config.can_read('aa')
+    assert access_config.can_read('owner_name')
+    assert not access_config.can_write('owner_name')
+    assert not access_config.can_write('owner_age')
+    assert access_config.can_write('owner')
+
+    access_config.writability['owner'] = False
+    access_config.compile()
+    assert not access_config.can_write('owner')
+
+def test_access_config_with_inline_flags():
+    access_config = AccessConfig({
+        re.compile('(?i)abc'): 'r',
+        re.compile('(?i)def'): 'r',
+        re.compile('ghi', re.I): 'r',
+    })
+
+    assert access_config.can_read('ABC')
+    assert access_config.can_read('Def')
+    assert access_config.can_read('GHI')
+    assert not access_config.can_read('jkl')
+
+def test_compiled_access_view_hides_source():
+    class SecretDog(DogModel):
+        _secret = 'bone'
+
+    dog = SecretDog(5, 'Edward', 'corgi', 'Daniel')
+    dog_view = compiled_access_view(dog, AccessConfig({**ALL_PUBLIC, **UNDERSCORE_PRIVATE}))
+
+    for i in ('_source', '_access_config', '_compiled_view_source', '_secret'):
+        with pt.raises(AttributeError):
+            getattr(dog_view, i)
+    assert dog not in dog_view.__dict__.values()
+    assert dog_view.name == 'Daniel'
+
+def test_compiled_access_view():
+    dog_hank = DogModel(5, 'Edward', 'corgi', 'Daniel')
+
+    access_config = AccessConfig({
+        **ALL_PUBLIC,
+        'owner': '!r !w !d',
+        'years': ('age', 'r w'),
+    })
+
+    dog_view = compiled_access_view(dog_hank, access_config)
+
+    assert isinstance(dog_view, AccessView)
+    assert type(dog_view) is type(compiled_access_view(DogModel(1, '', '', ''), access_config))
+    assert isinstance(type(dog_view).__dict__['bread'], property)
+
+    assert dog_view.bread == 'corgi'
+    assert dog_view.years == 5
+    dog_view.years = 6
+    assert dog_hank.age == 6
+
+    with pt.raises(AttributeError):
+        print(dog_view.owner)
+    with pt.raises(AttributeError):
+        dog_view.owner = 'Mike'
+    with pt.raises(AttributeError):
+        del dog_view.owner
+
+    dog_view.color = 'red'
+    assert dog_hank.color == 'red'
+    assert dog_view.color == 'red'
+
+    del dog_view.name
+    with pt.raises(AttributeError):
+        print(dog_view.name)
+
+def test_columnar_access_view():
+    dogs = [DogModel(i, 'Edward', 'corgi', f'Dog {i}') for i in range(10)]
+
+    access_config = AccessConfig({
+        **ALL_PUBLIC,
+        'owner': '!r !w !d',
+        'years': ('age', 'r w'),
+    })
+    dogs_view = ColumnarAccessView(dogs, access_config)
+
+    assert dogs_view.get_column('years', 'i') == array('i', range(10))
+    dogs_view.set_column('bread', ['husky'] * 10)
+    assert all(i.bread == 'husky' for i in dogs)
+
+    old_dogs = dogs_view.filter('years', lambda i: i >= 7)
+    assert old_dogs.get_column('name') == ['Dog 7', 'Dog 8', 'Dog 9']
+
+    with pt.raises(AttributeError):
+        dogs_view.get_column('owner')
+    with pt.raises(AttributeError):
+        dogs_view.set_column('owner', ['Mike'] * 10)
+    with pt.raises(ValueError):
+        dogs_view.set_column('name', ['Jack'])
+
+def test_columnar_access_view_dotted_names():
+    class Owner:
+        def __init__(self) -> None:
+            self._password = 'hunter2'
+
+    dogs = [DogModel(i, Owner(), 'corgi', f'Dog {i}') for i in range(3)]
+    dogs_view = ColumnarAccessView(dogs, AccessConfig({**ALL_PUBLIC, **UNDERSCORE_PRIVATE}))
+
+    with pt.raises(AttributeError):
+        dogs_view.get_column('owner._password')
@@ -0,0 +1,94 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from reactor.asyncreactor import AsyncReactor
+from reactor.component import Component
+from reactor.event import Event
+from reactor.injection import InjectionDispatcher
+from reactor.returningevent import ParallelReturningEvent, SequentialReturningEvent
+
+class IngredientsEvent(ParallelReturningEvent):
+    def __init__(self, source_component) -> None:
+        super().__init__(source_component)
+
+class AsyncIngredientComponent(Component):
+    def __init__(self, ingredient: str, delay: float) -> None:
+        super().__init__()
+        self.ingredient = ingredient
+        self.delay = delay
+
+    def on_event(self, reactor, event: Event) -> None:
+        async def asnc():
+            await asyncio.sleep(self.delay)
+            return self.ingredient
+        event.reply(self, reactor.run_async(asnc))
+
+    def get_handled_event_types(self) -> tuple[type]:
+        return (IngredientsEvent,)
+
+def test_async_reactor_own_loop():
+    reactor = AsyncReactor()
+
+    reactor.add_component(AsyncIngredientComponent('flour', 2 / 100))
+    reactor.add_component(AsyncIngredientComponent('eggs', 1 / 100))
+
+    reactor.emit(e := IngredientsEvent(None))
+    e.wait_for_reply()
+
+    assert list(e.get_reply().values()) == ['flour', 'eggs']
+    reactor.close()
+
+def test_async_reactor_running_loop():
+    async def main():
+        reactor = AsyncReactor(asyncio.get_running_loop())
+
+        for i in range(1000):
+            reactor.add_component(AsyncIngredientComponent(str(i), 1 / 100))
+
+        await reactor.emit_async(e := IngredientsEvent(None))
+        await e.wait_for_reply_async()
+
+        assert list(e.get_reply().values()) == [str(i) for i in range(1000)]
+        assert isinstance(await reactor.get_injectable_async(InjectionDispatcher), InjectionDispatcher)
+
+    asyncio.run(main())
+
+def test_awaiting_emit_completion_takes_no_threads():
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(1))
+        events = [IngredientsEvent(None) for _ in range(50)]
+        waiting = [asyncio.ensure_future(i.wait_for_reply_async()) for i in events]
+        await asyncio.sleep(0)
+
+        assert await asyncio.wait_for(loop.run_in_executor(None, lambda: 'free'), 1) == 'free'
+        threading.Thread(target=lambda: [i.on_emit_completed() for i in events]).start()
+        await asyncio.wait_for(asyncio.gather(*waiting), 1)
+
+    asyncio.run(main())
+
+class PriceEvent(SequentialReturningEvent):
+    def __init__(self, source_component) -> None:
+        super().__init__(source_component)
+
+class AsyncDoublingComponent(Component):
+    def on_event(self, reactor, event: Event) -> None:
+        async def stage(price):
+            await asyncio.sleep(1 / 100)
+            return price * 2
+        event.reply_after_previous(self, reactor, stage, 1, inline=True)
+
+    def get_handled_event_types(self) -> tuple[type]:
+        return (PriceEvent,)
+
+def test_async_reactor_coroutine_stages():
+    reactor = AsyncReactor()
+
+    reactor.add_component(AsyncDoublingComponent())
+    reactor.add_component(AsyncDoublingComponent())
+
+    reactor.emit(e := PriceEvent(None))
+    e.wait_for_reply()
+
+    assert e.previous_reply(None) == 4
+    reactor.close()
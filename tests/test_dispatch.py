@@ -0,0 +1,49 @@
+from reactor.component import Component
+from reactor.event import Event
+from reactor.simplereactor import SimpleReactor, TransformationModes
+
+class AnimalEvent(Event):
+    def __init__(self, source_component) -> None:
+        super().__init__(source_component)
+
+class DogEvent(AnimalEvent):
+    def __init__(self, source_component) -> None:
+        super().__init__(source_component)
+
+class RecordingComponent(Component):
+    def __init__(self, handled_event_types) -> None:
+        super().__init__()
+        self.handled_event_types = handled_event_types
+        self.received = []
+
+    def on_event(self, reactor, event: Event) -> None:
+        self.received.append(type(event))
+
+    def get_handled_event_types(self):
+        return self.handled_event_types
+
+def test_dispatch_by_event_type():
+    reactor = SimpleReactor()
+
+    reactor.add_component(animals := RecordingComponent((AnimalEvent,)))
+    reactor.add_component(dogs := RecordingComponent((DogEvent,)))
+    reactor.add_component(everything := RecordingComponent(None))
+
+    reactor.emit(AnimalEvent(None), TransformationModes.NONE)
+    reactor.emit(DogEvent(None), TransformationModes.NONE)
+
+    assert animals.received == [AnimalEvent, DogEvent]
+    assert dogs.received == [DogEvent]
+    assert everything.received == [AnimalEvent, DogEvent]
+
+def test_dispatch_after_adding_component():
+    reactor = SimpleReactor()
+
+    reactor.add_component(first := RecordingComponent((DogEvent,)))
+    reactor.emit(DogEvent(None), TransformationModes.NONE)
+    reactor.add_component(second := RecordingComponent((AnimalEvent,)))
+    reactor.emit(DogEvent(None), TransformationModes.NONE)
+
+    assert first.received == [DogEvent, DogEvent]
+    assert second.received == [DogEvent]
+    assert reactor.get_subscribers(DogEvent)[-2:] == [first, second]
@@ -1,5 +1,5 @@
-from reactor.fabrication import AttributesAppender, FabricationEvent
-from reactor.reactor import SimpleReactor
+from reactor.fabrication import AttributesAppender, BatchFabricationEvent, FabricationEvent, FabricationItem, InstancePool
+from reactor.simplereactor import SimpleReactor
 import pytest as pt
 
 class DogModel:
@@ -33,3 +33,128 @@ def test_fabrication():
     assert 'owner_age' in e.previous_reply(None).__dict__.keys() 
     assert 'owner_name' in e.previous_reply(None).__dict__.keys() 
     assert 'diet' in e.previous_reply(None).__dict__.keys() 
+
+def test_fabrication_plan():
+    reactor = SimpleReactor()
+    distributor = reactor.get_factory_distributor()
+
+    distributor.add_component(AttributesAppender(DogModel, {
+        'age': lambda i, e: 7,
+        'name': lambda i, e: 'Jack',
+    }))
+    distributor.add_component(AttributesAppender(DogModel, {
+        'name': lambda i, e: i.name + ' Russell',
+    }))
+
+    assert len(distributor.get_fabrication_plan(DogModel).get_factories()) == 2
+
+    reactor.emit(e := FabricationEvent(None, DogModel))
+    e.wait_for_reply()
+
+    assert e.previous_reply(None).age == 7
+    assert e.previous_reply(None).name == 'Jack Russell'
+
+    distributor.add_component(AttributesAppender(DogModel, {
+        'diet': lambda i, e: 'any',
+    }))
+    assert len(distributor.get_fabrication_plan(DogModel).get_factories()) == 3
+
+def test_batch_fabrication():
+    reactor = SimpleReactor()
+
+    reactor.add_component(AttributesAppender(DogModel, {
+        'age': lambda i, e: 7,
+        'name': lambda i, e: e.context,
+    }))
+    reactor.get_factory_distributor().add_component(AttributesAppender(DogModel, {
+        'owner': lambda i, e: 'Daniel',
+    }))
+
+    reactor.emit(e := BatchFabricationEvent(None, DogModel, contexts=['Jack', 'Bud', 'Hank']))
+    e.wait_for_reply()
+
+    dogs = e.previous_reply(None)
+    assert [i.name for i in dogs] == ['Jack', 'Bud', 'Hank']
+    assert all(i.age == 7 and i.owner == 'Daniel' for i in dogs)
+
+    reactor.emit(e := BatchFabricationEvent(None, DogModel, count=100))
+    e.wait_for_reply()
+    assert len(e.previous_reply(None)) == 100
+    assert all(isinstance(i, FabricationItem) and i.get_instance_type() is DogModel for i in e.get_items())
+
+    with pt.raises(ValueError):
+        BatchFabricationEvent(None, DogModel)
+
+def test_instance_pool():
+    reactor = SimpleReactor()
+    distributor = reactor.get_factory_distributor()
+    distributor.add_instance_pool(pool := InstancePool(DogModel, max_size=1))
+    distributor.add_component(AttributesAppender(DogModel, {
+        'age': lambda i, e: 7,
+    }))
+
+    reactor.emit(e := FabricationEvent(None, DogModel))
+    e.wait_for_reply()
+    dog = e.previous_reply(None)
+    dog.name = 'Jack'
+
+    assert distributor.release_instance(dog)
+    assert not distributor.release_instance(DogModel())
+    assert pool.get_size() == 1
+
+    reactor.emit(e := FabricationEvent(None, DogModel))
+    e.wait_for_reply()
+
+    assert e.previous_reply(None) is dog
+    assert dog.__dict__ == {'age': 7}
+    assert pool.get_hits_count() == 1
+    assert pool.get_misses_count() == 1
+    assert pool.get_dropped_count() == 1
+
+def test_slotted_fabrication():
+    reactor = SimpleReactor()
+    distributor = reactor.get_factory_distributor()
+    distributor.add_slotted_type(DogModel)
+    distributor.add_instance_pool(pool := InstancePool(DogModel))
+    distributor.add_component(AttributesAppender(DogModel, {
+        'age': lambda i, e: 7,
+        'name': lambda i, e: 'Jack',
+    }))
+    distributor.add_component(AttributesAppender(DogModel, {
+        'owner': lambda i, e: 'Daniel',
+    }))
+
+    reactor.emit(e := FabricationEvent(None, DogModel))
+    e.wait_for_reply()
+    dog = e.previous_reply(None)
+
+    assert isinstance(dog, DogModel)
+    assert type(dog).__slots__ == ('age', 'name', 'owner')
+    assert (dog.age, dog.name, dog.owner) == (7, 'Jack', 'Daniel')
+    assert dog.__dict__ == {}
+
+    assert distributor.release_instance(dog)
+    assert not hasattr(dog, 'age')
+    assert pool.get_size() == 1
+
+def test_slotted_fabrication_with_reactor_appenders():
+    reactor = SimpleReactor()
+    reactor.get_factory_distributor().add_slotted_type(DogModel)
+    reactor.add_component(AttributesAppender(DogModel, {
+        'age': lambda i, e: 7,
+    }))
+
+    reactor.emit(e := FabricationEvent(None, DogModel))
+    e.wait_for_reply()
+    dog = e.previous_reply(None)
+
+    assert type(dog).__slots__ == ('age',)
+    assert dog.age == 7
+    assert dog.__dict__ == {}
+
+def test_slotted_fabrication_without_appenders():
+    distributor = SimpleReactor().get_factory_distributor()
+    distributor.add_slotted_type(DogModel)
+
+    with pt.warns(UserWarning):
+        assert distributor.get_instance_class(DogModel).__slots__ == ()
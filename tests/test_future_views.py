@@ -1,7 +1,8 @@
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import threading
 from time import sleep
 from pytest import raises
-from reactor.data.futureview import ImmediateFutureView, AwaitingFutureView
+from reactor.data.futureview import ImmediateFutureView, AwaitingFutureView, DeferredFutureView, get_future_view_future, get_future_view_result, is_future_view_done, unwrap_future_view
 
 class DogModel:
     def __init__(self, age, owner, bread, name) -> None:
@@ -55,6 +56,40 @@ def test_awaitable_future():
     with raises(AttributeError):
         del future_view.owner
 
+def test_deferred_future():
+    thread_pool = ThreadPoolExecutor()
+    def asnc():
+        sleep(3 / 100)
+        return DogModel(6, 'Jenatan', 'husky', 'Bud')
+    future = thread_pool.submit(asnc)
+    future_view = DeferredFutureView(future)
+
+    future_view.name = 'Hank'
+    name = future_view.name
+    upper_name = future_view.name.upper()
+    del future_view.owner
+    owner = future_view.owner
+    assert not is_future_view_done(upper_name)
 
+    assert get_future_view_result(name, 1) == 'Hank'
+    assert get_future_view_result(upper_name, 1) == 'HANK'
+    with raises(AttributeError):
+        get_future_view_result(owner, 1)
+    assert get_future_view_future(future_view) is future
+    
+    assert get_future_view_result(future_view.age, 0) == 6
 
-    
\ No newline at end of file
+def test_resolved_future_view():
+    thread_pool = ThreadPoolExecutor()
+    dog = DogModel(6, 'Jenatan', 'husky', 'Bud')
+    release = threading.Event()
+    future = thread_pool.submit(lambda: (release.wait(), dog)[1])
+    future_view = ImmediateFutureView(future)
+    captured = threading.Event()
+    future.add_done_callback(lambda f: captured.set()) # Callbacks are run in the order they were added, so after the capturing one
+
+    assert unwrap_future_view(future_view) is future_view
+    release.set()
+    assert captured.wait(1)
+    assert unwrap_future_view(future_view) is dog
+    assert future_view.name == 'Bud'
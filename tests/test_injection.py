@@ -0,0 +1,126 @@
+from concurrent.futures import Future
+import pytest as pt
+from reactor.component import Component, Distributor
+from reactor.fabrication import FactoryDistributor
+from reactor.injection import BaseNamedInjectable, InjectionDispatcher, InjectionEvent
+from reactor.abstractreactor import InjectionModes
+from reactor.simplereactor import SimpleReactor
+
+class Storage(BaseNamedInjectable):
+    def __init__(self, injectable_name: str) -> None:
+        super().__init__(injectable_name)
+
+class FileStorage(Storage):
+    def __init__(self, injectable_name: str) -> None:
+        super().__init__(injectable_name)
+
+def test_injection_dispatcher_lookup():
+    dispatcher = InjectionDispatcher()
+    dispatcher.add_injectable(storage := Storage('storage'))
+    dispatcher.add_injectable(file_storage := FileStorage('file_storage'))
+
+    assert set(dispatcher.find_injectables(Storage)) == {storage, file_storage}
+    assert dispatcher.find_injectables(FileStorage) == [file_storage]
+    assert dispatcher.find_injectables('storage') == [storage]
+
+    dispatcher.remove_injectable(storage)
+    assert dispatcher.find_injectables(Storage) == [file_storage]
+    assert dispatcher.find_injectables('storage') == []
+    with pt.raises(KeyError):
+        dispatcher.remove_injectable(storage)
+    with pt.raises(TypeError):
+        dispatcher.find_injectables(5)
+
+def test_get_injectable():
+    reactor = SimpleReactor()
+    reactor.get_injection_dispatcher().add_injectable(file_storage := FileStorage('file_storage'))
+
+    assert reactor.get_injectable(Storage) is file_storage
+    assert reactor.get_injectable('file_storage') is file_storage
+    assert reactor.get_injectable(FactoryDistributor) is reactor.get_factory_distributor()
+
+def test_get_injectable_cache():
+    reactor = SimpleReactor()
+    reactor.get_injection_dispatcher().add_injectable(storage := Storage('storage'))
+
+    assert reactor.get_injectable(Storage) is storage
+    assert reactor._get_cached_injections(Storage) == (storage,)
+
+    reactor.get_injection_dispatcher().remove_injectable(storage)
+    reactor.get_injection_dispatcher().add_injectable(file_storage := FileStorage('storage'))
+    assert reactor._get_cached_injections(Storage) is None
+    assert reactor.get_injectable(Storage) is file_storage
+    assert reactor.get_injectable('storage') is file_storage
+
+def test_get_injectable_cache_with_mutating_chooser():
+    reactor = SimpleReactor()
+    reactor.get_injection_dispatcher().add_injectable(storage := Storage('storage'))
+    reactor.get_injection_dispatcher().add_injectable(file_storage := FileStorage('file_storage'))
+
+    assert reactor.get_injectable(Storage, injectable_chooser=lambda l: l.pop()) is file_storage
+    assert reactor.get_injectable(Storage, injectable_chooser=lambda l: l.pop()) is file_storage
+    assert reactor.get_injectable(Storage) is storage
+    assert reactor.get_injectable(Storage, injectable_chooser=len) == 2
+
+def test_get_injectable_cache_with_distributed_provider():
+    class InjectionProvider(Component):
+        def on_event(self, reactor, event) -> None:
+            if isinstance(event, InjectionEvent) and event.injection_query is Storage:
+                future = Future()
+                future.set_result([Storage('provided')])
+                event.reply(self, future)
+
+    class AllDistributor(Distributor):
+        def must_handle_event(self, reactor, event) -> bool:
+            return True
+
+    reactor = SimpleReactor()
+    reactor.add_component(outer := AllDistributor())
+    outer.add_component(inner := AllDistributor())
+
+    assert reactor.get_injectable(Storage, injectable_chooser=len) == 0
+    inner.add_component(InjectionProvider())
+    assert reactor.get_injectable(Storage, injectable_chooser=len) == 1
+
+def test_find_injectable():
+    reactor = SimpleReactor(max_threads=1, cache_injections=False)
+    reactor.get_injection_dispatcher().add_injectable(storage := Storage('storage'))
+
+    assert reactor.find_injectable('storage') is storage
+    assert reactor.find_injectable(Storage, lambda l: len(l)) == 1
+    assert reactor.run_async(lambda: reactor.get_injectable('storage')).result() is storage
+
+def test_inject():
+    reactor = SimpleReactor()
+    reactor.get_injection_dispatcher().add_injectable(storage := Storage('storage'))
+
+    class Service:
+        storage = reactor.inject(Storage)
+        shared_storage = reactor.inject('storage', shared=True)
+
+        @reactor.inject(Storage, InjectionModes.AWAITING_VIEW)
+        def storage_view(self):
+            """ Storage of the service """
+
+    service = Service()
+    assert 'storage' not in service.__dict__
+    assert service.storage is storage
+    assert service.__dict__['storage'] is storage
+    assert service.shared_storage is storage
+    assert 'shared_storage' not in service.__dict__
+    assert service.storage_view.get_injectable_name() == 'storage'
+    assert Service.storage_view.__doc__ == ' Storage of the service '
+
+def test_inject_unwrapping_views():
+    reactor = SimpleReactor()
+    reactor.get_injection_dispatcher().add_injectable(storage := Storage('storage'))
+
+    class Service:
+        storage = reactor.inject(Storage, InjectionModes.AWAITING_VIEW, unwrap_views=True)
+        shared_storage = reactor.inject(Storage, InjectionModes.AWAITING_VIEW, shared=True, unwrap_views=True)
+
+    service = Service()
+    assert service.storage.get_injectable_name() == 'storage'
+    assert service.storage is storage
+    assert service.shared_storage.get_injectable_name() == 'storage'
+    assert service.shared_storage is storage
@@ -1,5 +1,11 @@
-from reactor.reactor import Component, SimpleReactor
-from reactor.returningevent import Event, ParallelReturningEvent
+import asyncio
+import threading
+from concurrent.futures import TimeoutError
+from time import sleep
+from pytest import raises
+from reactor.component import Component
+from reactor.simplereactor import SimpleReactor
+from reactor.returningevent import Event, ParallelReturningEvent, ParallelReturningException
 
 # ParallelReturningEvent check 
 
@@ -33,4 +39,129 @@ def test_parallel_returning():
 
     e.wait_for_reply()
 
-    assert list(e.get_reply().values()) == ["flour","eggs","milk","butter","sugar","salt","apples"]
\ No newline at end of file
+    assert list(e.get_reply().values()) == ["flour","eggs","milk","butter","sugar","salt","apples"]
+
+class DelayedIngredientComponent(IngredientComponent):
+    def __init__(self, ingredient: str, delay: float) -> None:
+        super().__init__(ingredient)
+        self.delay = delay
+
+    def on_event(self, reactor, event: Event) -> None:
+        if isinstance(event, IngredientsEvent):
+            def asnc():
+                sleep(self.delay)
+                if self.ingredient == None:
+                    raise ValueError('No ingredient')
+                return self.ingredient
+            event.reply(self, reactor.run_async(asnc))
+
+class GatedIngredientComponent(IngredientComponent):
+    """ Replies once its gate is set, so tests decide the order of the replies """
+    def __init__(self, ingredient: str, gate: threading.Event = None) -> None:
+        super().__init__(ingredient)
+        self.gate = gate
+        self.started = threading.Event()
+
+    def on_event(self, reactor, event: Event) -> None:
+        if isinstance(event, IngredientsEvent):
+            def asnc():
+                self.started.set()
+                if self.gate is not None:
+                    self.gate.wait(5)
+                if self.ingredient == None:
+                    raise ValueError('No ingredient')
+                return self.ingredient
+            event.reply(self, reactor.run_async(asnc))
+
+def test_replies_as_completed():
+    reactor = SimpleReactor()
+
+    reactor.add_component(GatedIngredientComponent("flour", flour_gate := threading.Event()))
+    reactor.add_component(GatedIngredientComponent("eggs"))
+    reactor.add_component(GatedIngredientComponent(None, failure_gate := threading.Event()))
+
+    reactor.emit(e := IngredientsEvent(None))
+
+    replies = e.replies_as_completed()
+    assert next(replies)[1] == "eggs"
+    failure_gate.set()
+    with raises(ValueError):
+        next(replies)
+    flour_gate.set()
+    assert next(replies)[1] == "flour"
+    with raises(StopIteration):
+        next(replies)
+
+def test_replies_as_completed_async():
+    reactor = SimpleReactor()
+
+    reactor.add_component(GatedIngredientComponent("flour", flour_gate := threading.Event()))
+    reactor.add_component(GatedIngredientComponent("eggs"))
+    reactor.add_component(GatedIngredientComponent(None, failure_gate := threading.Event()))
+
+    reactor.emit(e := IngredientsEvent(None))
+
+    async def collect():
+        ret = []
+        replies = e.replies_as_completed_async()
+        ret.append((await replies.__anext__())[1])
+        failure_gate.set()
+        try:
+            await replies.__anext__()
+        except ValueError:
+            ret.append('ERR')
+        flour_gate.set()
+        ret.extend([i async for _, i in replies])
+        return ret
+
+    assert asyncio.run(collect()) == ["eggs", "ERR", "flour"]
+
+def test_wait_for_first_and_quorum():
+    reactor = SimpleReactor()
+
+    reactor.add_component(GatedIngredientComponent("flour", flour_gate := threading.Event()))
+    reactor.add_component(GatedIngredientComponent(None))
+    reactor.add_component(GatedIngredientComponent("eggs", eggs_gate := threading.Event()))
+    reactor.add_component(GatedIngredientComponent("milk", milk_gate := threading.Event()))
+
+    reactor.emit(e := IngredientsEvent(None))
+
+    eggs_gate.set()
+    assert e.wait_for_first()[1] == "eggs"
+    milk_gate.set()
+    assert set(e.wait_for_quorum(2).values()) == {"eggs", "milk"}
+    flour_gate.set()
+    with raises(ParallelReturningException):
+        e.wait_for_quorum(4)
+
+def test_wait_for_first_cancel_others():
+    reactor = SimpleReactor(max_threads=1)
+
+    reactor.add_component(GatedIngredientComponent("flour"))
+    reactor.add_component(eggs := GatedIngredientComponent("eggs", eggs_gate := threading.Event()))
+    reactor.add_component(GatedIngredientComponent("milk"))
+
+    reactor.emit(e := IngredientsEvent(None))
+
+    eggs.started.wait(5) # The only worker has finished flour and is running eggs, so only milk can still be cancelled
+    assert e.wait_for_first(cancel_others=True)[1] == "flour"
+    eggs_gate.set()
+    e.wait_for_reply()
+    assert list(e.get_reply().values()) == ["flour", "eggs"]
+
+def test_parallel_returning_timeout():
+    reactor = SimpleReactor(max_threads=2)
+
+    reactor.add_component(DelayedIngredientComponent("flour", 0))
+    reactor.add_component(DelayedIngredientComponent("eggs", 30 / 100))
+    reactor.add_component(DelayedIngredientComponent("milk", 30 / 100))
+    reactor.add_component(DelayedIngredientComponent("butter", 0))
+
+    reactor.emit(e := IngredientsEvent(None))
+    e.set_timeout(5 / 100)
+    e.wait_for_reply()
+
+    assert e.is_expired()
+    assert list(e.get_reply().values()) == ["flour"]
+    with raises(TimeoutError):
+        list(e.replies_as_completed())
@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+from threading import Event as ThreadingEvent
+from time import sleep
+from reactor.component import Component
+from reactor.event import Event, Priorities
+from reactor.priorityexecutor import PriorityThreadPoolExecutor
+from reactor.returningevent import ParallelReturningEvent
+from reactor.simplereactor import SimpleReactor
+
+def _run_blocked(executor, priorities):
+    """ Blocks the only worker of the executor, submits a callback per priority and returns the priorities in the order they were run """
+    release = ThreadingEvent()
+    order = []
+    executor.submit(release.wait)
+    futures = [executor.submit_with_priority(i, order.append, i) for i in priorities]
+    release.set()
+    for i in futures:
+        i.result()
+    return order
+
+def test_priority_order():
+    executor = PriorityThreadPoolExecutor(1)
+    order = _run_blocked(executor, [Priorities.LOW, Priorities.NORMAL, Priorities.CRITICAL, Priorities.HIGH, Priorities.CRITICAL])
+    assert order == [Priorities.CRITICAL, Priorities.CRITICAL, Priorities.HIGH, Priorities.NORMAL, Priorities.LOW]
+    executor.shutdown()
+
+def test_priority_aging():
+    executor = PriorityThreadPoolExecutor(1, aging_interval=1 / 100)
+    release = ThreadingEvent()
+    order = []
+    executor.submit(release.wait)
+    low = executor.submit_with_priority(Priorities.LOW, order.append, Priorities.LOW)
+    sleep(5 / 100)
+    critical = executor.submit_with_priority(Priorities.CRITICAL, order.append, Priorities.CRITICAL)
+    release.set()
+    low.result()
+    critical.result()
+
+    assert order == [Priorities.LOW, Priorities.CRITICAL]
+    executor.shutdown()
+
+class OrderEvent(ParallelReturningEvent):
+    def __init__(self, source_component, name: str) -> None:
+        super().__init__(source_component)
+        self.name = name
+
+class UrgentOrderEvent(OrderEvent):
+    priority = Priorities.CRITICAL
+
+    def __init__(self, source_component, name: str) -> None:
+        super().__init__(source_component, name)
+
+class OrderComponent(Component):
+    def __init__(self) -> None:
+        super().__init__()
+        self.names = []
+
+    def on_event(self, reactor, event: Event) -> None:
+        event.reply(self, reactor.run_async(lambda: self.names.append(event.name)))
+
+    def get_handled_event_types(self) -> tuple[type]:
+        return (OrderEvent,)
+
+def test_callbacks_inherit_event_priority():
+    reactor = SimpleReactor(max_threads=1)
+    reactor.add_component(component := OrderComponent())
+
+    release = ThreadingEvent()
+    reactor.run_async(release.wait)
+    reactor.emit(normal := OrderEvent(None, 'normal'))
+    reactor.emit(urgent := UrgentOrderEvent(None, 'urgent'))
+    release.set()
+    normal.wait_for_reply()
+    urgent.wait_for_reply()
+
+    assert component.names == ['urgent', 'normal']
+
+def test_reactor_shutdown():
+    reactor = SimpleReactor(max_threads=1)
+    done = []
+    reactor.run_async(lambda: (sleep(2 / 100), done.append(1)))
+    queued = reactor.run_async(lambda: done.append(2))
+
+    reactor.shutdown()
+    assert done == [1, 2] and queued.done()
+
+def test_callbacks_run_before_exit():
+    script = 'from time import sleep\n' \
+        'from reactor.simplereactor import SimpleReactor\n' \
+        'reactor = SimpleReactor()\n' \
+        'reactor.run_async(lambda: (sleep(5 / 100), print("replied", flush=True)))\n'
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=30, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.stdout == 'replied\n'
@@ -0,0 +1,35 @@
+from reactor.component import Component
+from reactor.event import Event
+from reactor.returningevent import ParallelReturningEvent
+from reactor.simplereactor import SimpleReactor
+
+class SumOfPowersEvent(ParallelReturningEvent):
+    def __init__(self, source_component, limit: int) -> None:
+        super().__init__(source_component)
+        self.limit = limit
+
+def sum_of_powers(limit: int, power: int) -> int:
+    return sum(i ** power for i in range(limit))
+
+class PowerComponent(Component):
+    def __init__(self, power: int) -> None:
+        super().__init__()
+        self.power = power
+
+    def on_event(self, reactor, event: Event) -> None:
+        event.reply(self, reactor.run_in_process(sum_of_powers, event.limit, self.power))
+
+    def get_handled_event_types(self) -> tuple[type]:
+        return (SumOfPowersEvent,)
+
+def test_process_reply():
+    reactor = SimpleReactor(max_processes=2)
+
+    reactor.add_component(PowerComponent(1))
+    reactor.add_component(PowerComponent(2))
+    reactor.add_component(PowerComponent(3))
+
+    reactor.emit(e := SumOfPowersEvent(None, 100))
+    e.wait_for_reply()
+
+    assert list(e.get_reply().values()) == [sum_of_powers(100, 1), sum_of_powers(100, 2), sum_of_powers(100, 3)]
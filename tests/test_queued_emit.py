@@ -0,0 +1,67 @@
+from queue import Full
+from threading import Event as ThreadingEvent
+import pytest as pt
+from reactor.component import Component
+from reactor.event import Event
+from reactor.simplereactor import QueueFullPolicies, SimpleReactor, TransformationModes
+
+class NumberEvent(Event):
+    def __init__(self, source_component, number: int) -> None:
+        super().__init__(source_component)
+        self.number = number
+
+class BlockedComponent(Component):
+    """ Blocks the dispatcher on the first event until released, so the test can fill the queue """
+    def __init__(self) -> None:
+        super().__init__()
+        self.numbers = []
+        self.received_first = ThreadingEvent()
+        self.release = ThreadingEvent()
+
+    def on_event(self, reactor, event: Event) -> None:
+        self.received_first.set()
+        self.release.wait()
+        self.numbers.append(event.number)
+
+    def get_handled_event_types(self) -> tuple[type]:
+        return (NumberEvent,)
+
+def _fill(policy):
+    reactor = SimpleReactor(queue_size=2, queue_full_policy=policy)
+    reactor.add_component(component := BlockedComponent())
+
+    reactor.emit_nowait(NumberEvent(None, 0), TransformationModes.NONE)
+    component.received_first.wait()
+    reactor.emit_nowait(NumberEvent(None, 1), TransformationModes.NONE)
+    reactor.emit_nowait(NumberEvent(None, 2), TransformationModes.NONE)
+    return reactor, component
+
+def test_queued_emit_drop_newest():
+    reactor, component = _fill(QueueFullPolicies.DROP_NEWEST)
+
+    assert not reactor.emit_nowait(NumberEvent(None, 3), TransformationModes.NONE)
+    component.release.set()
+    reactor.wait_for_queued_events()
+
+    assert component.numbers == [0, 1, 2]
+    assert reactor.get_dropped_events_count() == 1
+
+def test_queued_emit_drop_oldest():
+    reactor, component = _fill(QueueFullPolicies.DROP_OLDEST)
+
+    assert reactor.emit_nowait(NumberEvent(None, 3), TransformationModes.NONE)
+    component.release.set()
+    reactor.wait_for_queued_events()
+
+    assert component.numbers == [0, 2, 3]
+    assert reactor.get_dropped_events_count() == 1
+
+def test_queued_emit_raise():
+    reactor, component = _fill(QueueFullPolicies.RAISE)
+
+    with pt.raises(Full):
+        reactor.emit_nowait(NumberEvent(None, 3), TransformationModes.NONE)
+    component.release.set()
+    reactor.wait_for_queued_events()
+
+    assert component.numbers == [0, 1, 2]
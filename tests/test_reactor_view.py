@@ -0,0 +1,55 @@
+from reactor.component import Component
+from reactor.data.reactorview import MISSING, ReactorViewChangesEvent, SetterReactorView, SetterReactorViewEvent, batch_reactor_view
+from reactor.event import Event
+from reactor.simplereactor import SimpleReactor
+
+class DogModel:
+    def __init__(self, age, owner, bread, name) -> None:
+        self.age = age
+        self.owner = owner
+        self.bread = bread
+        self.name = name
+
+class ChangesListener(Component):
+    def __init__(self) -> None:
+        super().__init__()
+        self.events = []
+
+    def on_event(self, reactor, event: Event) -> None:
+        self.events.append(event)
+
+    def get_handled_event_types(self) -> tuple[type]:
+        return (SetterReactorViewEvent, ReactorViewChangesEvent)
+
+def test_setter_reactor_view():
+    reactor = SimpleReactor()
+    reactor.add_component(listener := ChangesListener())
+    dog = DogModel(6, 'Jenatan', 'husky', 'Bud')
+    dog_view = SetterReactorView(dog, reactor)
+
+    dog_view.age = 7
+    assert dog.age == 7
+    assert len(listener.events) == 1
+    assert listener.events[0].get_name() == 'age'
+
+def test_batched_reactor_view():
+    reactor = SimpleReactor()
+    reactor.add_component(listener := ChangesListener())
+    dog = DogModel(6, 'Jenatan', 'husky', 'Bud')
+    dog_view = SetterReactorView(dog, reactor)
+
+    with batch_reactor_view(dog_view):
+        for i in range(50):
+            dog_view.age = i
+        with batch_reactor_view(dog_view):
+            dog_view.name = 'Hank'
+            dog_view.color = 'white'
+        assert dog.age == 49
+        assert len(listener.events) == 0
+
+    assert len(listener.events) == 1
+    assert listener.events[0].get_changes() == {'age': (6, 49), 'name': ('Bud', 'Hank'), 'color': (MISSING, 'white')}
+
+    with batch_reactor_view(dog_view):
+        pass
+    assert len(listener.events) == 1
@@ -2,7 +2,7 @@ from threading import current_thread
 from time import sleep
 from reactor.component import Component
 from reactor.event import Event
-from reactor.reactor import SimpleReactor
+from reactor.simplereactor import SimpleReactor
 from reactor.returningevent import SequentialReturningEvent
 
 class MultiplyingEvent(SequentialReturningEvent):
@@ -14,6 +14,9 @@ class MultiplyingComponent(Component):
     def __init__(self, multiplier: int) -> None:
         super().__init__()
         self.multiplier = multiplier
+
+    def get_handled_event_types(self) -> tuple[type]:
+        return (MultiplyingEvent,)
     
     def on_event(self, reactor, event: MultiplyingEvent) -> None:
         def asnc():
@@ -39,4 +42,36 @@ def test_sequential_returning():
 
     e.wait_for_reply()
 
-    assert e.previous_reply(None) == 120
\ No newline at end of file
+    assert e.previous_reply(None) == 120
+
+def test_long_sequential_returning():
+    reactor = SimpleReactor()
+
+    for i in range(200):
+        reactor.add_component(MultiplyingComponent(1))
+    reactor.add_component(MultiplyingComponent(7))
+
+    reactor.emit(e := MultiplyingEvent(None, 1))
+
+    e.wait_for_reply()
+
+    assert e.previous_reply(None) == 7
+    assert e.previous_entry(None)[0].multiplier == 7
+
+class ContinuingMultiplyingComponent(MultiplyingComponent):
+    def on_event(self, reactor, event: MultiplyingEvent) -> None:
+        event.reply_after_previous(self, reactor, lambda p: p * self.multiplier, event.number)
+
+def test_continuation_sequential_returning():
+    reactor = SimpleReactor(max_threads=1)
+
+    for i in range(100):
+        reactor.add_component(ContinuingMultiplyingComponent(1))
+    reactor.add_component(ContinuingMultiplyingComponent(2))
+    reactor.add_component(ContinuingMultiplyingComponent(3))
+
+    reactor.emit(e := MultiplyingEvent(None, 5))
+
+    e.wait_for_reply()
+
+    assert e.previous_reply(None) == 30
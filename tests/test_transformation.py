@@ -0,0 +1,57 @@
+from reactor.component import Component
+from reactor.event import Event
+from reactor.simplereactor import SimpleReactor, TransformationModes
+from reactor.transformation import TransformEvent
+
+class GreetingEvent(Event):
+    def __init__(self, source_component, greeting: str) -> None:
+        super().__init__(source_component)
+        self.greeting = greeting
+
+class LoudTransformer(Component):
+    def on_event(self, reactor, event: Event) -> None:
+        if isinstance(event, TransformEvent):
+            def asnc():
+                previous = event.previous_reply(self, event.event)
+                return GreetingEvent(None, previous.greeting.upper())
+            event.reply(self, reactor.run_async(asnc))
+
+    def get_handled_event_types(self) -> tuple[type]:
+        return (TransformEvent,)
+
+class GreetingListener(Component):
+    def __init__(self) -> None:
+        super().__init__()
+        self.greetings = []
+
+    def on_event(self, reactor, event: Event) -> None:
+        self.greetings.append(event.greeting)
+
+    def get_handled_event_types(self) -> tuple[type]:
+        return (GreetingEvent,)
+
+def test_transformation_skipped_without_transformers():
+    reactor = SimpleReactor()
+    reactor.add_component(listener := GreetingListener())
+
+    assert not reactor.has_transformers()
+    reactor.emit(GreetingEvent(None, 'hi'))
+    reactor.emit(GreetingEvent(None, 'hey'), TransformationModes.ONLY_DISTRIBUTOR)
+
+    assert listener.greetings == ['hi', 'hey']
+    assert reactor.get_skipped_transformations_count() == 2
+
+def test_transformation():
+    reactor = SimpleReactor()
+    reactor.add_component(listener := GreetingListener())
+    reactor.add_component(LoudTransformer())
+    reactor.get_transformation_distributor().add_component(LoudTransformer())
+
+    assert reactor.has_transformers(TransformationModes.ALL)
+    assert reactor.has_transformers(TransformationModes.ONLY_DISTRIBUTOR)
+    reactor.emit(GreetingEvent(None, 'hi'))
+    reactor.emit(GreetingEvent(None, 'hey'), TransformationModes.ONLY_DISTRIBUTOR)
+    reactor.emit(GreetingEvent(None, 'hello'), TransformationModes.NONE)
+
+    assert listener.greetings == ['HI', 'HEY', 'hello']
+    assert reactor.get_skipped_transformations_count() == 0